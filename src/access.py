@@ -1,23 +1,31 @@
 from config import settings
 
-from database.tables.users import getUser
-from database.tables.employees import getEmployee
-from database.tables.permissions import getRolePermissions
+from references import getRolePermissions
 
-from api.telegram import TelegramAPI
+from database.tables.users import getUserWithEmployee
+
+from api.telegram import AsyncTelegramAPI
 
 from aiogram.types import Message, CallbackQuery
 
+from contextvars import ContextVar
 import functools
 
 
-def hasEmployeeAccess(employee: dict, required_permissions: tuple) -> bool:
+# (update key, memoized lookups) of the update being handled in the current task
+update_memo: ContextVar[tuple[tuple, dict] | None] = ContextVar("update_memo", default=None)
+
+
+async def getRolePermissionsSlugs(role_id: int) -> frozenset:
+    "Returns the role permissions slugs from the references registry."
+    return await getRolePermissions(role_id)
+
+
+async def hasEmployeeAccess(employee: dict, required_permissions: tuple) -> bool:
     "Checks whether the employee has access permissions."
 
     employee_role_id: int = employee["role_id"]
-    employee_permissions = [
-        permission["slug"] for permission in getRolePermissions(employee_role_id)
-    ]
+    employee_permissions: frozenset = await getRolePermissionsSlugs(employee_role_id)
     for permission in required_permissions:
         if permission not in employee_permissions:
             return False
@@ -25,6 +33,42 @@ def hasEmployeeAccess(employee: dict, required_permissions: tuple) -> bool:
     return True
 
 
+def _getUpdateMemo(event: Message | CallbackQuery) -> dict:
+    "Returns the lookups memo of the update the event belongs to."
+
+    if isinstance(event, CallbackQuery):
+        update_key = ("callback_query", event.id)
+    else:
+        update_key = ("message", event.chat.id, event.message_id)
+
+    current_memo: tuple | None = update_memo.get()
+    if current_memo and current_memo[0] == update_key:
+        return current_memo[1]
+
+    memo = {}
+    update_memo.set((update_key, memo))
+    return memo
+
+
+async def _loadEventSender(event: Message | CallbackQuery) -> dict:
+    "Loads the user and the employee who sent the event with one query per update."
+
+    memo: dict = _getUpdateMemo(event)
+    if "user" not in memo:
+        memo["user"], memo["employee"] = await getUserWithEmployee(telegram_id=event.from_user.id)
+    return memo
+
+
+async def getEventUser(event: Message | CallbackQuery) -> dict | None:
+    "Returns the user who sent the event, querying the database once per update."
+    return (await _loadEventSender(event))["user"]
+
+
+async def getEventEmployee(event: Message | CallbackQuery) -> dict | None:
+    "Returns the employee who sent the event, querying the database once per update."
+    return (await _loadEventSender(event))["employee"]
+
+
 def access_checker(required_permissions: tuple[str] = None): 
     "Checks the user's access permissions to the function."
 
@@ -36,7 +80,7 @@ def access_checker(required_permissions: tuple[str] = None):
             event: Message | CallbackQuery = args[0]
             telegram_id = event.from_user.id
 
-            user: dict | None = getUser(telegram_id=telegram_id)
+            user: dict | None = await getEventUser(event)
 
             if "state" in kwargs.keys():
                 state = kwargs["state"]
@@ -54,15 +98,14 @@ def access_checker(required_permissions: tuple[str] = None):
 
             # Check user permissions
             if required_permissions:
-                user_id: int = user["id"]
-                employee: dict | None = getEmployee(user_id=user_id)
-                if (not employee) or (not hasEmployeeAccess(employee, required_permissions)):
+                employee: dict | None = await getEventEmployee(event)
+                if (not employee) or (not await hasEmployeeAccess(employee, required_permissions)):
                     is_execution_allowed = False
                     info_message_text = "*🚫 У Вас недостаточно прав для доступа к данному разделу*"
 
             if is_execution_allowed is False:
-                telegram_api = TelegramAPI(settings.TELEGRAM_BOT_TOKEN)
-                telegram_api.sendRequest(
+                telegram_api = AsyncTelegramAPI(settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_API_URL)
+                await telegram_api.sendRequest(
                     request_method="POST",
                     api_method="sendMessage",
                     parameters={
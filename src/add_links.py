@@ -1,11 +1,11 @@
 from config import settings
 
 from states import makeNextStateCallback
+from modules.stats import invalidateStatsCache
 
-from database.tables.add_links import getAddLink, increaseAddLinkActivations
-from database.tables.users import createUser, getUser
+from database.tables.add_links import activateAddLink
 
-from api.telegram import TelegramAPI
+from api.telegram import AsyncTelegramAPI
 
 from aiogram.types import Message, CallbackQuery
 
@@ -36,12 +36,10 @@ def add_link_checker():
             if not add_link_id:
                 return await func(*args, **kwargs)
 
-            if not _canActivateAddLink(add_link_id, telegram_id):
+            if not await _activateAddLink(add_link_id, telegram_id):
                 return await func(*args, **kwargs)
 
-            _activateAddLink(add_link_id, telegram_id)
-
-            _sendSuccessfulActivationMessage(event, telegram_id)
+            await _sendSuccessfulActivationMessage(event, telegram_id)
             
         return wrapper
     return container
@@ -56,32 +54,18 @@ def _extractAddLinkID(event: Message) -> str | None:
         return None
 
 
-def _canActivateAddLink(add_link_id: str, telegram_id: int) -> bool:
-    add_link = getAddLink(add_link_id)
-    if not add_link:
-        return False
-    
-    activations = add_link['activations']
-    activations_limit = add_link['activations_limit']
-    
-    if activations >= activations_limit:
-        return False
+async def _activateAddLink(add_link_id: str, telegram_id: int) -> bool:
+    "Creates the user if the add link is valid and has activations left. Returns whether it was activated."
 
-    user: dict | None = getUser(telegram_id=telegram_id)
-    if user:
+    user_id: int | None = await activateAddLink(add_link_id, telegram_id)
+    if not user_id:
         return False
 
+    await invalidateStatsCache("users")
     return True
 
 
-def _activateAddLink(add_link_id: str, telegram_id: int) -> None:
-    add_link = getAddLink(add_link_id)
-    phone = add_link['data']["phone"]
-    createUser(telegram_id=telegram_id, phone=phone)
-    increaseAddLinkActivations(add_link_id)
-
-
-def _sendSuccessfulActivationMessage(event: Message, telegram_id: int) -> None:
+async def _sendSuccessfulActivationMessage(event: Message, telegram_id: int) -> None:
     message_text = (
         "*👋 Рад Вас видеть!*\n\n"
         + "🚀 Ассистент «JackCars» активирован."
@@ -94,8 +78,8 @@ def _sendSuccessfulActivationMessage(event: Message, telegram_id: int) -> None:
         }]]
     })
 
-    telegram_api = TelegramAPI(settings.TELEGRAM_BOT_TOKEN)
-    telegram_api.sendRequest(
+    telegram_api = AsyncTelegramAPI(settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_API_URL)
+    await telegram_api.sendRequest(
         request_method="POST",
         api_method="sendMessage",
         parameters={
@@ -1,12 +1,17 @@
 import requests
+import aiohttp
 import io
 
 from aiogram.types import FSInputFile
 
 
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+
 class TelegramAPI:
-    def __init__(self, bot_token: str) -> None:
+    def __init__(self, bot_token: str, api_url: str = TELEGRAM_API_URL) -> None:
         self.bot_token = bot_token
+        self.api_url = api_url.rstrip("/")
 
     def sendRequest(self, request_method: str, api_method: str, parameters: dict = {}, files: dict = None) -> dict:
         """
@@ -18,7 +23,7 @@ class TelegramAPI:
         :param files: dict of files to upload (for multipart/form-data).
         """
 
-        url = f"https://api.telegram.org/bot{self.bot_token}/{api_method}"
+        url = f"{self.api_url}/bot{self.bot_token}/{api_method}"
         
         if files:
             files_dict = {}
@@ -54,3 +59,93 @@ class TelegramAPI:
         }
         
         return response
+
+
+class AsyncTelegramAPI:
+    """
+    Asynchronous Telegram API client with the same call surface as `TelegramAPI`.
+    All the instances share one keep-alive HTTP session, so requests don't repeat the TLS handshake.
+    """
+
+    _session: aiohttp.ClientSession | None = None
+
+    def __init__(self, bot_token: str, api_url: str = TELEGRAM_API_URL) -> None:
+        self.bot_token = bot_token
+        self.api_url = api_url.rstrip("/")
+
+    @classmethod
+    def getSession(cls) -> aiohttp.ClientSession:
+        "Returns the shared HTTP session, creating it on first use."
+
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=60),
+            )
+        return cls._session
+
+    @classmethod
+    async def closeSession(cls) -> None:
+        "Closes the shared HTTP session (called on bot shutdown)."
+
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+
+    async def sendRequest(
+        self, 
+        request_method: str, 
+        api_method: str, 
+        parameters: dict = {}, 
+        files: dict = None
+    ) -> dict:
+        """
+        Sends request to Telegram API.
+
+        :param request_method: http request method (`get` or `post`).
+        :param api_method: the required method in Telegram API.
+        :param parameters: dict of parameters which will used in the Telegram API method.
+        :param files: dict of files to upload (for multipart/form-data).
+        """
+
+        url = f"{self.api_url}/bot{self.bot_token}/{api_method}"
+        parameters = {k: str(v) for k, v in parameters.items()}
+        session: aiohttp.ClientSession = self.getSession()
+
+        if files:
+            form = aiohttp.FormData()
+            for key, value in parameters.items():
+                form.add_field(key, value)
+
+            opened_files = []
+            for key, file_input in files.items():
+                if isinstance(file_input, FSInputFile):
+                    file_obj = open(file_input.path, "rb")
+                    opened_files.append(file_obj)
+                    form.add_field(key, file_obj, filename=file_input.filename)
+                else:
+                    form.add_field(key, file_input)
+
+            try:
+                async with session.request(request_method.upper(), url, data=form) as r:
+                    response = {
+                        "code": r.status,
+                        "text": await r.text(),
+                    }
+            finally:
+                for file_obj in opened_files:
+                    file_obj.close()
+        else:
+            match request_method.upper():
+                case "GET":
+                    request_kwargs = {"params": parameters}
+                case "POST":
+                    request_kwargs = {"data": parameters}
+
+            async with session.request(request_method.upper(), url, **request_kwargs) as r:
+                response = {
+                    "code": r.status,
+                    "text": await r.text(),
+                }
+
+        return response
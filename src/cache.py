@@ -1,13 +1,22 @@
 from config import settings
+from logs import addLog
 
-import redis
+import redis.asyncio as redis
 
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+import asyncio
+import json
+import time
 
-redis_pool = redis.ConnectionPool(
+
+# Waits up to `CACHE_POOL_TIMEOUT` for a free connection instead of failing when all are in use
+redis_pool = redis.BlockingConnectionPool(
     host=settings.CACHE_HOST,
     port=settings.CACHE_PORT,
     db=settings.CACHE_DB,
     max_connections=settings.CACHE_MAX_CONNECTIONS,
+    timeout=settings.CACHE_POOL_TIMEOUT,
 )
 
 redis_client = redis.Redis(connection_pool=redis_pool)
@@ -19,18 +28,275 @@ HOUR_SECONDS = MINUTE_SECONDS ** 2
 DAY_SECONDS = HOUR_SECONDS * 24
 
 
-def setCacheValue(key: str, value: str, expire: int = MINUTE_SECONDS*10) -> None:
-    redis_client.set(key, value, ex=expire)
-    
-def getCacheValue(key: str) -> str | None:
-    value: bytes | None = redis_client.get(key)
-    if value:
-        return value.decode('utf-8')
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+CACHE_TAG_VERSION_EXPIRE = DAY_SECONDS * 7
+
+# Sets the key (KEYS[1]) and registers it in the tags (KEYS[2..n+1]) only if none of the tags versions 
+# (KEYS[n+2..2n+1]) changed since the value was loaded (ARGV[4..n+3]), see `_loadAndSetCacheValue()`.
+# ARGV: value, expire, n, versions. Returns 1 if the value was set.
+SET_TAGGED_CACHE_VALUE_SCRIPT = """
+local tags_count = tonumber(ARGV[3])
+for i = 1, tags_count do
+    if (redis.call("GET", KEYS[1 + tags_count + i]) or "0") ~= ARGV[3 + i] then
+        return 0
+    end
+end
+
+local expire = tonumber(ARGV[2])
+redis.call("SET", KEYS[1], ARGV[1], "EX", expire)
+for i = 1, tags_count do
+    local tag_key = KEYS[1 + i]
+    redis.call("SADD", tag_key, KEYS[1])
+    if redis.call("TTL", tag_key) < expire then
+        redis.call("EXPIRE", tag_key, expire)
+    end
+end
+return 1
+"""
+
+set_tagged_cache_value = redis_client.register_script(SET_TAGGED_CACHE_VALUE_SCRIPT)
+
+
+class LocalCache:
+    """
+    In-process LRU cache with expiration, used in front of Redis for small and hot values.
+
+    :param max_size: maximum number of stored keys, the least recently used are evicted first.
+    :param ttl: maximum number of seconds a value is kept, bounds the staleness if an invalidation is missed.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: int = 60) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._values: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        "Returns a pair (found, value)."
+
+        item: tuple | None = self._values.get(key)
+        if item is None or item[1] < time.monotonic():
+            if item is not None:
+                del self._values[key]
+            self._stats["misses"] += 1
+            return False, None
+
+        self._values.move_to_end(key)
+        self._stats["hits"] += 1
+        return True, item[0]
+
+    def set(self, key: str, value: Any, ttl: int = None) -> None:
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+        self._values[key] = (value, time.monotonic() + ttl)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def getStats(self) -> dict:
+        stats = dict(self._stats)
+        stats["size"] = len(self._values)
+        return stats
+
+
+local_cache = LocalCache(max_size=settings.LOCAL_CACHE_MAX_SIZE, ttl=settings.LOCAL_CACHE_TTL)
+
+# key -> task loading the value (shared by concurrent misses of the same key)
+loading_tasks: dict[str, asyncio.Task] = {}
+
+
+def makeCacheKey(name: str, **params) -> str:
+    "Builds a key like `employees?role_slug=manager&car_service_id=1`."
+    if not params:
+        return name
+    return name + "?" + "&".join(f"{param}={value}" for param, value in params.items())
+
+def _makeCacheTagKey(tag: str) -> str:
+    return f"cache_tag:{tag}"
+
+def _makeCacheTagVersionKey(tag: str) -> str:
+    return f"cache_tag_version:{tag}"
+
+def _dumpCacheValue(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+def _loadCacheValue(value: bytes | None, default: Any = None) -> Any:
+    if value is None:
+        return default
+    try:
+        return json.loads(value)
+    except ValueError:
+        return default
+
+
+async def setCacheValue(key: str, value: Any, expire: int = MINUTE_SECONDS*10, tags: tuple = ()) -> None:
+    """
+    Saves a JSON-serializable value.
+
+    :param tags: tags registering the key, all the keys of a tag are deleted by `invalidateCacheTags()`.
+    """
+
+    if not tags:
+        await redis_client.set(key, _dumpCacheValue(value), ex=expire)
+        return
+
+    async with redis_client.pipeline(transaction=False) as pipeline:
+        pipeline.set(key, _dumpCacheValue(value), ex=expire)
+        for tag in tags:
+            tag_key: str = _makeCacheTagKey(tag)
+            pipeline.sadd(tag_key, key)
+            # The tag outlives all its keys, then expires with the names of the expired ones
+            pipeline.expire(tag_key, expire, nx=True)
+            pipeline.expire(tag_key, expire, gt=True)
+        await pipeline.execute()
+
+async def getCacheValue(key: str, default: Any = None) -> Any:
+    "Returns the deserialized value or `default` if the key is missing."
+    value: bytes | None = await redis_client.get(key)
+    return _loadCacheValue(value, default)
+
+async def setCacheValues(values: dict[str, Any], expire: int = MINUTE_SECONDS*10) -> None:
+    "Saves several values in one round-trip."
+    async with redis_client.pipeline(transaction=False) as pipeline:
+        for key, value in values.items():
+            pipeline.set(key, _dumpCacheValue(value), ex=expire)
+        await pipeline.execute()
+
+async def getCacheValues(keys: list[str], default: Any = None) -> dict[str, Any]:
+    "Returns the deserialized values of several keys in one round-trip."
+    if not keys:
+        return {}
+    values: list = await redis_client.mget(keys)
+    return {key: _loadCacheValue(value, default) for key, value in zip(keys, values)}
+
+async def getOrSetCacheValue(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    expire: int = MINUTE_SECONDS*10,
+    local: bool = False,
+    tags: tuple = ()
+) -> Any:
+    """
+    Returns the cached value, loading and caching it on a miss.
+    Concurrent misses of the same key wait for a single `loader` call.
+
+    :param loader: coroutine function returning the value to cache.
+    :param local: if `True`, the value is also kept in the in-process cache in front of Redis
+    (for small reference data read on nearly every request).
+    :param tags: see `setCacheValue()`.
+    """
+
+    if local:
+        found, value = local_cache.get(key)
+        if found:
+            return value
+
+    value: Any = await getCacheValue(key)
+    if value is None:
+        task: asyncio.Task | None = loading_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_loadAndSetCacheValue(key, loader, expire, tags))
+            loading_tasks[key] = task
+            task.add_done_callback(lambda _: loading_tasks.pop(key, None))
+        value, is_cached = await asyncio.shield(task)
+        if not is_cached:
+            return value
+
+    if local:
+        local_cache.set(key, value, ttl=expire)
+
+    return value
+
+async def _loadAndSetCacheValue(
+    key: str, 
+    loader: Callable[[], Awaitable[Any]], 
+    expire: int, 
+    tags: tuple
+) -> tuple[Any, bool]:
+    """
+    Returns the loaded value and whether it was cached.
+    A tagged value isn't cached if its tags were invalidated while it was loading, 
+    as it could be loaded before the change the invalidation is about.
+    """
+
+    if not tags:
+        value: Any = await loader()
+        await setCacheValue(key, value, expire=expire)
+        return value, True
+
+    versions_keys: list = [_makeCacheTagVersionKey(tag) for tag in tags]
+    versions: list = [version or b"0" for version in await redis_client.mget(versions_keys)]
+
+    value: Any = await loader()
+    is_cached: int = await set_tagged_cache_value(
+        keys=[key, *(_makeCacheTagKey(tag) for tag in tags), *versions_keys],
+        args=[_dumpCacheValue(value), expire, len(tags), *versions],
+    )
+    return value, bool(is_cached)
+
+async def deleteCacheKey(key: str) -> None:
+    "Deletes the key from Redis and from the in-process caches of all the bot processes."
+    local_cache.delete(key)
+    await redis_client.delete(key)
+    await redis_client.publish(CACHE_INVALIDATION_CHANNEL, json.dumps({"key": key}))
+
+async def invalidateCacheTags(*tags: str) -> None:
+    """
+    Deletes all the keys registered with the tags (in Redis and in all the in-process caches).
+    The tags versions are bumped, so the values being loaded at the moment aren't cached.
+    """
+
+    tags_keys: list = [_makeCacheTagKey(tag) for tag in tags]
+    async with redis_client.pipeline(transaction=True) as pipeline:
+        for tag in tags:
+            version_key: str = _makeCacheTagVersionKey(tag)
+            pipeline.incr(version_key)
+            pipeline.expire(version_key, CACHE_TAG_VERSION_EXPIRE)
+        for tag_key in tags_keys:
+            pipeline.smembers(tag_key)
+        pipeline.delete(*tags_keys)
+        results: list = await pipeline.execute()
+
+    tags_members: list = results[len(tags) * 2:-1]
+    keys: list = sorted({key.decode() for members in tags_members for key in members})
+    if not keys:
+        return
+
+    for key in keys:
+        local_cache.delete(key)
+    await redis_client.delete(*keys)
+    await redis_client.publish(CACHE_INVALIDATION_CHANNEL, json.dumps({"keys": keys}))
+
+async def runCacheInvalidationListener() -> None:
+    "Background loop applying the invalidations published by other bot processes to the in-process cache."
 
-def deleteCacheKey(key: str) -> None:
-    redis_client.delete(key)
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Values cached while the listener was down could be stale
+                local_cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    invalidation: dict = _loadCacheValue(message["data"], default={})
+                    if "key" in invalidation:
+                        local_cache.delete(invalidation["key"])
+                    elif "keys" in invalidation:
+                        for key in invalidation["keys"]:
+                            local_cache.delete(key)
+        except Exception as e:
+            addLog(level="error", text=f"Cache invalidation listener failed, resubscribing: {e}")
+            local_cache.clear()
+            await asyncio.sleep(5)
 
-def getCacheKeyTTL(key: str) -> int | None:
-    ttl = redis_client.ttl(key)
+async def getCacheKeyTTL(key: str) -> int | None:
+    ttl = await redis_client.ttl(key)
     if ttl not in [-2, -1]:
         return ttl
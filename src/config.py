@@ -1,11 +1,23 @@
 from pathlib import Path
 from pydantic_settings import BaseSettings
+from typing import Literal
 
 
 class Settings(BaseSettings):
     # Telegram Bot
     TELEGRAM_BOT_TOKEN: str
     TELEGRAM_BOT_USERNAME: str
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    BOT_MODE: Literal["polling", "webhook"] = "polling"
+
+    # Webhook
+    WEBHOOK_URL: str | None = None # public base URL, the webhook isn't set if empty
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_WORKERS: int = 16
+    WEBHOOK_QUEUE_SIZE: int = 100 # updates waiting per worker
 
     # Database
     DB_HOST: str
@@ -13,12 +25,34 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 60 * 30
+    DB_POOL_HEALTH_CHECK_SECONDS: int = 30
 
     # Cache
     CACHE_HOST: str
     CACHE_PORT: int
     CACHE_DB: int
-    CACHE_MAX_CONNECTIONS: int
+    CACHE_MAX_CONNECTIONS: int # shared by the handlers, the FSM storage and 2 pub/sub listeners holding 1 connection each
+    CACHE_POOL_TIMEOUT: float = 10.0 # seconds to wait for a free connection
+    LOCAL_CACHE_MAX_SIZE: int = 1024
+    LOCAL_CACHE_TTL: int = 60
+
+    # FSM
+    FSM_STORAGE: Literal["memory", "redis"] = "redis"
+    FSM_STATE_TTL: int = 60 * 60 * 24 # seconds an untouched form (state and data) is kept
+    FSM_STATES_TTL: dict[str, int] = {} # states group name -> state TTL, e.g. {"Mailing": 3600}
+
+    # Alerts
+    ALERTS_CONCURRENCY: int = 10
+
+    # Mailing
+    MAILING_CONCURRENCY: int = 10
+    MAILING_BATCH_SIZE: int = 100 # users loaded and checkpointed at once
+    MAILING_RATE_LIMIT: float = 30 # messages per second across all chats
+    MAILING_CHAT_INTERVAL: float = 1.0 # seconds between messages to the same chat
 
     class Config:
         env_file = Path(__file__).parent / ".env"
@@ -2,9 +2,11 @@ import sys
 sys.path.append("../") # src/
 
 from config import settings
+from database.pool import ConnectionPool
 
 import psycopg2
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Iterator
 
 
 def getDatabaseConnection() -> psycopg2.extensions.connection:
@@ -17,6 +19,41 @@ def getDatabaseConnection() -> psycopg2.extensions.connection:
     )
 
 
+pool = ConnectionPool(
+    connect=getDatabaseConnection,
+    min_size=settings.DB_POOL_MIN_SIZE,
+    max_size=settings.DB_POOL_MAX_SIZE,
+    timeout=settings.DB_POOL_TIMEOUT,
+    recycle_seconds=settings.DB_POOL_RECYCLE_SECONDS,
+    health_check_seconds=settings.DB_POOL_HEALTH_CHECK_SECONDS,
+)
+
+
+@contextmanager
+def getPooledConnection() -> Iterator[psycopg2.extensions.connection]:
+    """
+    Checks out a connection from the process-wide pool for a single transaction.
+    The transaction is committed on success and rolled back on error, 
+    broken connections are discarded instead of being returned to the pool.
+    """
+
+    connection = pool.getConnection()
+    discard = False
+    try:
+        with connection:
+            yield connection
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        discard = True
+        raise
+    finally:
+        pool.putConnection(connection, discard=discard)
+
+
+def getPoolStats() -> dict:
+    "Returns the database connection pool metrics."
+    return pool.getStats()
+
+
 def execute(stmt: str, params: tuple, returning: bool = False) -> None | Any:
     """
     Executes an SQL statement query.
@@ -25,7 +62,7 @@ def execute(stmt: str, params: tuple, returning: bool = False) -> None | Any:
     :param returning: set to `True` if the sql query contains the `RETURNING` statement.
     """
 
-    with getDatabaseConnection() as connection:
+    with getPooledConnection() as connection:
         with connection.cursor() as cursor:
             cursor.execute(stmt, params)
             if returning:
@@ -42,7 +79,7 @@ def fetch(query: str, params: tuple = None, fetch_type: str = "one", as_dict: bo
     :param as_dict: if `True`, returns the response in the dictionary view.
     """
 
-    with getDatabaseConnection() as connection:
+    with getPooledConnection() as connection:
         with connection.cursor() as cursor:
             cursor.execute(query, params)
 
@@ -52,11 +89,12 @@ def fetch(query: str, params: tuple = None, fetch_type: str = "one", as_dict: bo
                 case _:
                     raise ValueError("Invalid fetch_type")
 
+            columns = [desk[0] for desk in cursor.description]
+
     if not response:
         response = list()
 
     if as_dict and response:
-        columns = [desk[0] for desk in cursor.description]
         match fetch_type:
             case "one":
                 response = [dict(zip(columns, response))]
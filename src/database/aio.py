@@ -0,0 +1,45 @@
+import sys
+sys.path.append("../") # src/
+
+from config import settings
+
+import database
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+import asyncio
+import functools
+
+
+# Never more threads than pooled connections, so a thread never waits for a connection
+executor = ThreadPoolExecutor(max_workers=settings.DB_POOL_MAX_SIZE, thread_name_prefix="database")
+
+
+async def execute(stmt: str, params: tuple, returning: bool = False) -> None | Any:
+    """
+    Executes an SQL statement query without blocking the event loop.
+    
+    :param stmt: SQL statement query.
+    :param returning: set to `True` if the sql query contains the `RETURNING` statement.
+    """
+
+    return await runInExecutor(database.execute, stmt, params, returning=returning)
+
+
+async def fetch(query: str, params: tuple = None, fetch_type: str = "one", as_dict: bool = False) -> list:
+    """
+    Executes an SQL fetch query without blocking the event loop.
+    
+    :param query: SQL fetch query.
+    :param fetch_type: if `one`, the fetchone() function will be executed, if `all` - the fetchall().
+    :param as_dict: if `True`, returns the response in the dictionary view.
+    """
+
+    return await runInExecutor(database.fetch, query, params, fetch_type=fetch_type, as_dict=as_dict)
+
+
+async def runInExecutor(func: Callable, *args, **kwargs) -> Any:
+    "Runs a blocking database function in the database threads pool."
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
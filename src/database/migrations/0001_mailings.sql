@@ -0,0 +1,16 @@
+-- Mailing jobs delivered by the background mailing worker (modules/mailing.py)
+
+CREATE TABLE IF NOT EXISTS mailings (
+    id SERIAL PRIMARY KEY,
+    employee_id INTEGER NOT NULL REFERENCES employees (id),
+    text TEXT NOT NULL,
+    image_path TEXT,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending', -- pending / running / completed
+    last_user_id INTEGER NOT NULL DEFAULT 0, -- users are delivered in `id` order, resume point after a crash
+    heartbeat_at TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS mailings_status_idx ON mailings (status);
@@ -0,0 +1,3 @@
+-- Mailing images are sent by their Telegram file_id instead of a local file path
+
+ALTER TABLE mailings RENAME COLUMN image_path TO image_file_id;
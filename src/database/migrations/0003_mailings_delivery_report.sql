@@ -0,0 +1,10 @@
+-- Per-mailing delivery accounting and the admin message showing it
+
+ALTER TABLE mailings
+    ADD COLUMN recipients_count INTEGER,
+    ADD COLUMN sent_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN failed_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN blocked_count INTEGER NOT NULL DEFAULT 0, -- users who blocked the bot or deleted their account
+    ADD COLUMN rate_limited_count INTEGER NOT NULL DEFAULT 0, -- 429 answers, retried afterwards
+    ADD COLUMN status_chat_id BIGINT,
+    ADD COLUMN status_message_id BIGINT;
@@ -0,0 +1,36 @@
+-- Daily statistics rollups per car service and employee, maintained by
+-- setFeedbackRequestCompleted and increaseAddLinkActivations (database/tables/*)
+
+CREATE TABLE IF NOT EXISTS stats_daily (
+    day DATE NOT NULL,
+    car_service_id INTEGER NOT NULL REFERENCES car_services (id),
+    employee_id INTEGER NOT NULL REFERENCES employees (id),
+    completed_feedback_requests INTEGER NOT NULL DEFAULT 0,
+    add_link_activations INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, car_service_id, employee_id)
+);
+
+-- Backfill from the history. Activation times were never stored, 
+-- so past activations are attributed to the add link creation day.
+
+INSERT INTO stats_daily (day, car_service_id, employee_id, completed_feedback_requests)
+SELECT completed_at::date, car_service_id, employee_id, COUNT(*)
+FROM feedback_requests
+WHERE completed_at IS NOT NULL AND employee_id IS NOT NULL
+GROUP BY completed_at::date, car_service_id, employee_id
+ON CONFLICT (day, car_service_id, employee_id) DO UPDATE 
+SET completed_feedback_requests = EXCLUDED.completed_feedback_requests;
+
+INSERT INTO stats_daily (day, car_service_id, employee_id, add_link_activations)
+SELECT al.created_at::date, ecs.car_service_id, al.employee_id, SUM(al.activations)
+FROM add_links al
+JOIN (
+    SELECT employee_id, MIN(car_service_id) AS car_service_id
+    FROM car_services_employees
+    GROUP BY employee_id
+) ecs
+    ON ecs.employee_id = al.employee_id
+WHERE al.activations > 0
+GROUP BY al.created_at::date, ecs.car_service_id, al.employee_id
+ON CONFLICT (day, car_service_id, employee_id) DO UPDATE 
+SET add_link_activations = EXCLUDED.add_link_activations;
@@ -0,0 +1,16 @@
+-- Notifications written in the same statement as the changes they are about
+-- (database/tables/*) and delivered by the outbox dispatcher (modules/outbox.py)
+
+CREATE TABLE IF NOT EXISTS outbox (
+    id BIGSERIAL PRIMARY KEY,
+    event VARCHAR(64) NOT NULL, -- feedback_request_created / feedback_request_taken / review_created
+    payload JSONB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL, -- the event isn't dispatched earlier (retries backoff)
+    locked_until TIMESTAMP, -- lease of the dispatcher which claimed the event
+    processed_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS outbox_pending_idx ON outbox (available_at) WHERE processed_at IS NULL;
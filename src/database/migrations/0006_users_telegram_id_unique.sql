@@ -0,0 +1,4 @@
+-- One user per Telegram account, relied on by the add link activation (activateAddLink)
+-- to create the user with ON CONFLICT. Fails if duplicated telegram_id rows already exist.
+
+CREATE UNIQUE INDEX IF NOT EXISTS users_telegram_id_idx ON users (telegram_id);
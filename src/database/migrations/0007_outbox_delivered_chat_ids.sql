@@ -0,0 +1,5 @@
+-- Recepients who already received the outbox event, skipped when the event is retried
+
+ALTER TABLE outbox ADD COLUMN IF NOT EXISTS delivered_chat_ids BIGINT[] NOT NULL DEFAULT '{}';
+
+CREATE INDEX IF NOT EXISTS outbox_processed_at_idx ON outbox (processed_at) WHERE processed_at IS NOT NULL;
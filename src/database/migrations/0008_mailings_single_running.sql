@@ -0,0 +1,5 @@
+-- At most one running mailing across all the bot processes: the Telegram rate limit is per bot token,
+-- while the mailing rate limiter (modules/mailing.py) is per process. Relied on by claimMailing.
+-- Fails if several running mailings already exist.
+
+CREATE UNIQUE INDEX IF NOT EXISTS mailings_single_running_idx ON mailings ((TRUE)) WHERE status = 'running';
@@ -0,0 +1,212 @@
+import psycopg2
+import psycopg2.extensions
+
+from collections import deque
+from typing import Callable
+import threading
+import time
+
+
+class PoolTimeoutError(Exception):
+    "Raised when no connection could be checked out of the pool in time."
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of PostgreSQL connections shared by the whole process.
+
+    :param connect: function opening a new database connection.
+    :param min_size: number of connections opened by `warmUp()` and kept ready.
+    :param max_size: maximum number of simultaneously opened connections.
+    :param timeout: maximum number of seconds to wait for a free connection.
+    :param recycle_seconds: age after which a connection is closed and reopened on checkout.
+    :param health_check_seconds: idle time after which a connection is pinged before being handed out.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], psycopg2.extensions.connection],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        recycle_seconds: int = 1800,
+        health_check_seconds: int = 30,
+    ) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size [min: {min_size} / max: {max_size}].")
+
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle_seconds = recycle_seconds
+        self.health_check_seconds = health_check_seconds
+
+        self._condition = threading.Condition()
+        self._idle: deque[tuple[psycopg2.extensions.connection, float]] = deque()
+        self._created_at: dict[int, float] = {}
+        self._size = 0
+
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "max_wait_time": 0.0,
+            "timeouts": 0,
+            "opened": 0,
+            "closed": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+        }
+
+    def warmUp(self) -> None:
+        "Opens `min_size` connections in advance so the first requests don't pay for the handshake."
+
+        connections = []
+        for _ in range(self.min_size - self._size):
+            connections.append(self.getConnection())
+        for connection in connections:
+            self.putConnection(connection)
+
+    def getConnection(self) -> psycopg2.extensions.connection:
+        "Checks out a healthy connection, waiting up to `timeout` seconds if the pool is exhausted."
+
+        started_at = time.monotonic()
+        waited = False
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection, released_at = None, None
+                    break
+
+                waited = True
+                remaining = self.timeout - (time.monotonic() - started_at)
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No free database connection within {self.timeout} seconds [size: {self._size}]."
+                    )
+                self._condition.wait(remaining)
+
+            wait_time = time.monotonic() - started_at
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += wait_time
+                self._stats["max_wait_time"] = max(self._stats["max_wait_time"], wait_time)
+
+        try:
+            if connection is not None:
+                connection = self._checkConnection(connection, released_at)
+            if connection is None:
+                connection = self._openConnection()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        return connection
+
+    def putConnection(self, connection: psycopg2.extensions.connection, discard: bool = False) -> None:
+        """
+        Returns a connection to the pool.
+
+        :param discard: if `True`, the connection is closed instead of being reused.
+        """
+
+        if not discard and not connection.closed:
+            try:
+                if connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or connection.closed:
+            self._closeConnection(connection)
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def close(self) -> None:
+        "Closes all idle connections."
+
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _ in idle:
+            self._closeConnection(connection)
+
+    def getStats(self) -> dict:
+        "Returns the pool metrics: checkouts, waits, wait time and current occupancy."
+
+        with self._condition:
+            stats = dict(self._stats)
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._size - len(self._idle)
+
+        stats["avg_wait_time"] = (stats["wait_time"] / stats["waits"]) if stats["waits"] else 0.0
+        return stats
+
+    def _openConnection(self) -> psycopg2.extensions.connection:
+        connection = self.connect()
+        self._created_at[id(connection)] = time.monotonic()
+        with self._condition:
+            self._stats["opened"] += 1
+        return connection
+
+    def _closeConnection(self, connection: psycopg2.extensions.connection) -> None:
+        self._created_at.pop(id(connection), None)
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+        with self._condition:
+            self._stats["closed"] += 1
+
+    def _checkConnection(
+        self,
+        connection: psycopg2.extensions.connection,
+        released_at: float
+    ) -> psycopg2.extensions.connection | None:
+        "Returns the connection if it's still usable, otherwise closes it and returns `None`."
+
+        now = time.monotonic()
+
+        if connection.closed:
+            self._closeConnection(connection)
+            return None
+
+        created_at = self._created_at.get(id(connection), now)
+        if self.recycle_seconds and now - created_at > self.recycle_seconds:
+            self._closeConnection(connection)
+            with self._condition:
+                self._stats["recycled"] += 1
+            return None
+
+        if now - released_at > self.health_check_seconds:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                connection.rollback()
+            except psycopg2.Error:
+                self._closeConnection(connection)
+                with self._condition:
+                    self._stats["health_check_failures"] += 1
+                return None
+
+        return connection
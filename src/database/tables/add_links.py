@@ -3,13 +3,13 @@ sys.path.append("../../") # src/
 
 from utils.common import getCurrentDateTime
 
-from database import execute, fetch
+from database.aio import execute, fetch
 
 from datetime import datetime
 import json
 
 
-def createAddLink(add_link_id: str, employee_id: int, data: dict, activations_limit: int = 1):
+async def createAddLink(add_link_id: str, employee_id: int, data: dict, activations_limit: int = 1):
     activations = 0
     data = json.dumps(data)
     created_at: datetime = getCurrentDateTime()
@@ -22,10 +22,10 @@ def createAddLink(add_link_id: str, employee_id: int, data: dict, activations_li
 
     params = (add_link_id, employee_id, data, activations, activations_limit, created_at)
 
-    execute(stmt, params)
+    await execute(stmt, params)
 
 
-def getAddLink(add_link_id: str) -> dict | None:
+async def getAddLink(add_link_id: str) -> dict | None:
     query = """
         SELECT id, employee_id, data, activations, activations_limit, created_at
         FROM add_links
@@ -34,7 +34,7 @@ def getAddLink(add_link_id: str) -> dict | None:
 
     params = (add_link_id, )
 
-    response: list = fetch(query, params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
 
     try:
         add_link: dict = response[0]
@@ -44,24 +44,71 @@ def getAddLink(add_link_id: str) -> dict | None:
     return add_link
 
 
-def getAddLinks() -> list:
+async def getAddLinks() -> list:
     query = """
         SELECT id, employee_id, data, activations, activations_limit, created_at
         FROM add_links
     """
 
-    add_links: list = fetch(query, fetch_type="all", as_dict=True)
+    add_links: list = await fetch(query, fetch_type="all", as_dict=True)
 
     return add_links
 
 
-def increaseAddLinkActivations(add_link_id: str) -> None:
+async def activateAddLink(add_link_id: str, telegram_id: int) -> int | None:
+    """
+    Creates the user from the add link data, counts the activation on the add link 
+    and in the daily statistics rollup, all in one statement.
+    Returns the new user id, or `None` if the add link doesn't exist, has no activations left 
+    or the user already exists.
+
+    The add link row is locked and its limit rechecked on the latest version, 
+    so concurrent activations can't exceed `activations_limit`.
+    """
+
+    activated_at: datetime = getCurrentDateTime()
+
     stmt = """
-        UPDATE add_links
-        SET activations = activations + 1
-        WHERE id = %s
+        WITH add_link AS (
+            SELECT id, employee_id, data
+            FROM add_links
+            WHERE 
+                id = %s 
+                AND activations < activations_limit
+                AND NOT EXISTS (SELECT 1 FROM users WHERE telegram_id = %s)
+            FOR UPDATE
+        ), new_user AS (
+            INSERT INTO users (telegram_id, phone, created_at)
+            SELECT %s, data->>'phone', %s
+            FROM add_link
+            ON CONFLICT (telegram_id) DO NOTHING
+            RETURNING id
+        ), activated AS (
+            UPDATE add_links
+            SET activations = activations + 1
+            WHERE id = (SELECT id FROM add_link) AND EXISTS (SELECT 1 FROM new_user)
+            RETURNING employee_id
+        ), stats AS (
+            INSERT INTO stats_daily (day, car_service_id, employee_id, add_link_activations)
+            SELECT %s, ecs.car_service_id, a.employee_id, 1
+            FROM activated a
+            JOIN (
+                SELECT employee_id, MIN(car_service_id) AS car_service_id
+                FROM car_services_employees
+                GROUP BY employee_id
+            ) ecs
+                ON ecs.employee_id = a.employee_id
+            ON CONFLICT (day, car_service_id, employee_id) DO UPDATE 
+            SET add_link_activations = stats_daily.add_link_activations + 1
+        )
+        SELECT id FROM new_user
     """
 
-    params = (add_link_id, )
+    params = (add_link_id, telegram_id, telegram_id, activated_at, activated_at.date())
+
+    new_row: tuple | None = await execute(stmt, params, returning=True)
+    if not new_row:
+        return None
 
-    execute(stmt, params)
+    user_id: int = new_row[0]
+    return user_id
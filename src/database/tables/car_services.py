@@ -1,16 +1,16 @@
 import sys
 sys.path.append("../../") # src/
 
-from database import fetch
+from database.aio import fetch
 
 
-def getCarServices() -> list:
+async def getCarServices() -> list:
     query = "SELECT id, slug, name, yandex_maps_url FROM car_services"
-    car_services: list = fetch(query, fetch_type="all", as_dict=True)
+    car_services: list = await fetch(query, fetch_type="all", as_dict=True)
     return car_services
 
 
-def getCarService(car_service_id: int) -> dict | None:
+async def getCarService(car_service_id: int) -> dict | None:
     query = """
         SELECT id, slug, name, yandex_maps_url
         FROM car_services
@@ -19,7 +19,7 @@ def getCarService(car_service_id: int) -> dict | None:
 
     params = (car_service_id, )
 
-    response: list = fetch(query, params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
 
     try:
         car_service: dict = response[0]
@@ -29,7 +29,7 @@ def getCarService(car_service_id: int) -> dict | None:
     return car_service
 
 
-def getEmployeeCarServices(employee_id: int) -> list:
+async def getEmployeeCarServices(employee_id: int) -> list:
     query = """
         SELECT car_service_id 
         FROM car_services_employees
@@ -38,6 +38,6 @@ def getEmployeeCarServices(employee_id: int) -> list:
 
     params = (employee_id, )
 
-    employee_car_services: list = fetch(query, params, fetch_type="all", as_dict=True)
+    employee_car_services: list = await fetch(query, params, fetch_type="all", as_dict=True)
 
     return employee_car_services
@@ -1,16 +1,16 @@
 import sys
 sys.path.append("../../") # src/
 
-from database import fetch
+from database.aio import fetch
 
 
-def getContactMethods() -> list:
+async def getContactMethods() -> list:
     query = "SELECT id, slug, name FROM contact_methods"
-    contact_methods: list = fetch(query, fetch_type="all", as_dict=True)
+    contact_methods: list = await fetch(query, fetch_type="all", as_dict=True)
     return contact_methods
 
 
-def getContactMethod(contact_method_id: int) -> dict | None:
+async def getContactMethod(contact_method_id: int) -> dict | None:
     query = """
         SELECT id, slug, name
         FROM contact_methods
@@ -19,7 +19,7 @@ def getContactMethod(contact_method_id: int) -> dict | None:
 
     params = (contact_method_id, )
 
-    response: list = fetch(query, params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
 
     try:
         contact_method: dict = response[0]
@@ -2,14 +2,15 @@ import sys
 sys.path.append("../../") # src/
 
 from utils.common import getCurrentDateTime
+from cache import invalidateCacheTags
 
-from database import execute, fetch
+from database.aio import execute, fetch
 from database.utils import makeQueryConditions
 
 from datetime import datetime
 
 
-def createEmployee(user_id: int, role_id: int, fullname: str) -> None:
+async def createEmployee(user_id: int, role_id: int, fullname: str) -> None:
     created_at: datetime = getCurrentDateTime()
 
     stmt = """
@@ -20,10 +21,11 @@ def createEmployee(user_id: int, role_id: int, fullname: str) -> None:
     
     params = (user_id, role_id, fullname, created_at)
 
-    execute(stmt, params)
+    await execute(stmt, params)
+    await invalidateCacheTags("employees")
 
 
-def getEmployee(employee_id: int = None, user_id: int = None) -> dict | None:
+async def getEmployee(employee_id: int = None, user_id: int = None) -> dict | None:
     if (not employee_id) and (not user_id):
         raise AttributeError("At least one argument must be passed")
 
@@ -36,7 +38,7 @@ def getEmployee(employee_id: int = None, user_id: int = None) -> dict | None:
         {conditions_string}
     """
 
-    response: list = fetch(query, conditions_params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, conditions_params, fetch_type="one", as_dict=True)
 
     try:
         employee: dict = response[0]
@@ -46,7 +48,7 @@ def getEmployee(employee_id: int = None, user_id: int = None) -> dict | None:
     return employee
 
 
-def getCarServiceEmployees(car_service_id: int, role_id: int = None) -> list:
+async def getCarServiceEmployees(car_service_id: int, role_id: int = None) -> list:
     if not role_id:
         query = "SELECT employee_id FROM car_services_employees WHERE car_service_id = %s"
         params = (car_service_id, )
@@ -64,6 +66,6 @@ def getCarServiceEmployees(car_service_id: int, role_id: int = None) -> list:
         """
         params = (car_service_id, role_id, )
 
-    car_service_employees: list = fetch(query, params, fetch_type="all", as_dict=True)
+    car_service_employees: list = await fetch(query, params, fetch_type="all", as_dict=True)
 
     return car_service_employees
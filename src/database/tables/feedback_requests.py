@@ -3,37 +3,49 @@ sys.path.append("../../") # src/
 
 from utils.common import getCurrentDateTime
 
-from database import execute, fetch
+from database.aio import execute, fetch
 from database.utils import makeQueryConditions
 
 from datetime import datetime
 
 
-def createFeedbackRequest(
+async def createFeedbackRequest(
     user_id: int, 
     car_service_id: int, 
     employee_id: int, 
     contact_method_id: int, 
     request_reason: str
 ) -> None:
+    "Saves the request together with its `feedback_request_created` outbox event in the same statement."
+
     created_at: datetime = getCurrentDateTime()
 
     stmt = """
-        INSERT INTO feedback_requests
-        (user_id, car_service_id, employee_id, contact_method_id, request_reason, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        RETURNING id
+        WITH created AS (
+            INSERT INTO feedback_requests
+            (user_id, car_service_id, employee_id, contact_method_id, request_reason, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING id
+        ), outbox_event AS (
+            INSERT INTO outbox (event, payload, available_at, created_at)
+            SELECT 'feedback_request_created', json_build_object('feedback_request_id', id), %s, %s
+            FROM created
+        )
+        SELECT id FROM created
     """
     
-    params = (user_id, car_service_id, employee_id, contact_method_id, request_reason, created_at)
+    params = (
+        user_id, car_service_id, employee_id, contact_method_id, request_reason, created_at, 
+        created_at, created_at
+    )
 
-    new_row: tuple = execute(stmt, params, returning=True)
+    new_row: tuple = await execute(stmt, params, returning=True)
     
     feedback_request_id: int = new_row[0]
     return feedback_request_id
 
 
-def getFeedbackRequest(feedback_request_id: int) -> dict | None:
+async def getFeedbackRequest(feedback_request_id: int) -> dict | None:
     query = """
         SELECT 
             id, user_id, car_service_id, 
@@ -48,7 +60,53 @@ def getFeedbackRequest(feedback_request_id: int) -> dict | None:
 
     params = (feedback_request_id, )
 
-    response: list = fetch(query, params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
+
+    try:
+        feedback_request: dict = response[0]
+    except IndexError:
+        feedback_request = None
+
+    return feedback_request
+
+
+async def getFeedbackRequestDetails(feedback_request_id: int) -> dict | None:
+    """
+    Returns the feedback request with all the fields needed to display it, joined in one query:
+    `user_phone`, `user_telegram_id`, `car_service_name`, `employee_fullname`, 
+    `employee_telegram_id`, `contact_method_name`.
+    """
+
+    query = """
+        SELECT 
+            fr.id, fr.user_id, fr.car_service_id, 
+            fr.employee_id, fr.contact_method_id, 
+            fr.request_reason, fr.taken_at, 
+            fr.completed_at, fr.created_at,
+            u.phone AS user_phone,
+            u.telegram_id AS user_telegram_id,
+            cs.name AS car_service_name,
+            e.fullname AS employee_fullname,
+            eu.telegram_id AS employee_telegram_id,
+            cm.name AS contact_method_name
+        FROM feedback_requests fr
+        JOIN users u
+            ON u.id = fr.user_id
+        JOIN car_services cs
+            ON cs.id = fr.car_service_id
+        LEFT JOIN employees e
+            ON e.id = fr.employee_id
+        LEFT JOIN users eu
+            ON eu.id = e.user_id
+        LEFT JOIN contact_methods cm
+            ON cm.id = fr.contact_method_id
+        WHERE 
+            fr.id = %s
+    """
+
+    params = (feedback_request_id, )
+
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
 
     try:
         feedback_request: dict = response[0]
@@ -58,7 +116,7 @@ def getFeedbackRequest(feedback_request_id: int) -> dict | None:
     return feedback_request
 
 
-def getFeedbackRequests(
+async def getFeedbackRequests(
     user_id: int = None, 
     car_service_id: int = None, 
     employee_id: int = None, 
@@ -85,12 +143,73 @@ def getFeedbackRequests(
         {conditions_string}
     """
 
-    feedback_requests: list = fetch(query, conditions_params, fetch_type="all", as_dict=True)
+    feedback_requests: list = await fetch(query, conditions_params, fetch_type="all", as_dict=True)
 
     return feedback_requests
 
 
-def getLastUserFeedbackRequest(user_id: int) -> dict | None:
+async def getActiveFeedbackRequestsPage(
+    user_id: int = None,
+    employee_id: int = None,
+    limit: int = 5,
+    offset: int = 0
+) -> tuple[list, int]:
+    """
+    Returns a page of not completed feedback requests with the phone of their authors 
+    and the total number of such requests, using a single query.
+
+    :param user_id: only requests created by the user.
+    :param employee_id: only requests of the employee's car services which are unassigned or assigned to this employee.
+    """
+
+    conditions = ["fr.completed_at IS NULL"]
+    params = []
+
+    if user_id:
+        conditions.append("fr.user_id = %s")
+        params.append(user_id)
+
+    if employee_id:
+        conditions.append("""
+            fr.car_service_id = ANY(
+                ARRAY(SELECT car_service_id FROM car_services_employees WHERE employee_id = %s)
+            )
+            AND (fr.employee_id IS NULL OR fr.employee_id = %s)
+        """)
+        params.extend((employee_id, employee_id))
+
+    conditions_string = " AND ".join(conditions)
+
+    query = f"""
+        SELECT 
+            fr.id, fr.user_id, fr.car_service_id, 
+            fr.employee_id, fr.contact_method_id, 
+            fr.request_reason, fr.taken_at, 
+            fr.completed_at, fr.created_at,
+            u.phone AS user_phone,
+            COUNT(*) OVER () AS total_count
+        FROM 
+            feedback_requests fr
+        JOIN users u
+            ON u.id = fr.user_id
+        WHERE 
+            {conditions_string}
+        ORDER BY 
+            fr.created_at, fr.id
+        LIMIT %s
+        OFFSET %s
+    """
+
+    params.extend((limit, offset))
+
+    feedback_requests: list = await fetch(query, tuple(params), fetch_type="all", as_dict=True)
+
+    total_count: int = feedback_requests[0]["total_count"] if feedback_requests else 0
+
+    return feedback_requests, total_count
+
+
+async def getLastUserFeedbackRequest(user_id: int) -> dict | None:
     query = """
         SELECT 
             id, user_id, car_service_id, 
@@ -108,7 +227,7 @@ def getLastUserFeedbackRequest(user_id: int) -> dict | None:
 
     params = (user_id, )
 
-    response: list = fetch(query, params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
 
     try:
         feedback_request: dict = response[0]
@@ -118,29 +237,48 @@ def getLastUserFeedbackRequest(user_id: int) -> dict | None:
     return feedback_request
 
 
-def setFeedbackRequestTaken(feedback_request_id: int, employee_id: int) -> None:
+async def setFeedbackRequestTaken(feedback_request_id: int, employee_id: int) -> None:
+    "Marks the request taken and adds its `feedback_request_taken` outbox event in the same statement."
+
     taken_at: datetime = getCurrentDateTime()
 
     stmt = """
-        UPDATE feedback_requests
-        SET employee_id = %s, taken_at = %s
-        WHERE id = %s
+        WITH taken AS (
+            UPDATE feedback_requests
+            SET employee_id = %s, taken_at = %s
+            WHERE id = %s
+            RETURNING id
+        )
+        INSERT INTO outbox (event, payload, available_at, created_at)
+        SELECT 'feedback_request_taken', json_build_object('feedback_request_id', id), %s, %s
+        FROM taken
     """
     
-    params = (employee_id, taken_at, feedback_request_id)
+    params = (employee_id, taken_at, feedback_request_id, taken_at, taken_at)
+
+    await execute(stmt, params)
 
-    execute(stmt, params)
 
+async def setFeedbackRequestCompleted(feedback_request_id: int) -> None:
+    "Marks the request completed and counts it in the daily statistics rollup in the same statement."
 
-def setFeedbackRequestCompleted(feedback_request_id: int) -> None:
     completed_at: datetime = getCurrentDateTime()
 
     stmt = """
-        UPDATE feedback_requests
-        SET completed_at = %s
-        WHERE id = %s
+        WITH completed AS (
+            UPDATE feedback_requests
+            SET completed_at = %s
+            WHERE id = %s AND completed_at IS NULL
+            RETURNING completed_at, car_service_id, employee_id
+        )
+        INSERT INTO stats_daily (day, car_service_id, employee_id, completed_feedback_requests)
+        SELECT completed_at::date, car_service_id, employee_id, 1
+        FROM completed
+        WHERE employee_id IS NOT NULL
+        ON CONFLICT (day, car_service_id, employee_id) DO UPDATE 
+        SET completed_feedback_requests = stats_daily.completed_feedback_requests + 1
     """
     
     params = (completed_at, feedback_request_id)
 
-    execute(stmt, params)
+    await execute(stmt, params)
@@ -0,0 +1,169 @@
+import sys
+sys.path.append("../../") # src/
+
+from utils.common import getCurrentDateTime
+
+from database.aio import execute, fetch
+
+from datetime import datetime, timedelta
+import psycopg2.errors
+
+
+MAILING_COLUMNS = """
+    id, employee_id, text, image_file_id, status, last_user_id, 
+    recipients_count, sent_count, failed_count, blocked_count, rate_limited_count, 
+    status_chat_id, status_message_id, started_at, finished_at, created_at
+"""
+
+
+async def createMailing(
+    employee_id: int, 
+    text: str, 
+    image_file_id: str = None,
+    status_chat_id: int = None,
+    status_message_id: int = None
+) -> int:
+    created_at: datetime = getCurrentDateTime()
+
+    stmt = """
+        INSERT INTO mailings
+        (employee_id, text, image_file_id, status_chat_id, status_message_id, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id
+    """
+
+    params = (employee_id, text, image_file_id, status_chat_id, status_message_id, created_at)
+
+    new_row: tuple = await execute(stmt, params, returning=True)
+
+    mailing_id: int = new_row[0]
+    return mailing_id
+
+
+async def getMailing(mailing_id: int) -> dict | None:
+    query = f"""
+        SELECT {MAILING_COLUMNS}
+        FROM mailings
+        WHERE id = %s
+    """
+
+    params = (mailing_id, )
+
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
+
+    try:
+        mailing: dict = response[0]
+    except IndexError:
+        mailing = None
+
+    return mailing
+
+
+async def claimMailing(lease_seconds: int) -> dict | None:
+    """
+    Marks the oldest pending mailing as running and returns it.
+    A running mailing whose heartbeat is older than `lease_seconds` is considered abandoned 
+    (its worker crashed) and is claimed again to be resumed.
+    Only one mailing runs at once across all the workers, as the Telegram rate limit is per bot token: 
+    `None` is returned while another mailing is running.
+    """
+
+    now: datetime = getCurrentDateTime()
+    heartbeat_deadline: datetime = now - timedelta(seconds=lease_seconds)
+
+    query = f"""
+        UPDATE mailings
+        SET 
+            status = 'running', 
+            heartbeat_at = %s, 
+            started_at = COALESCE(started_at, %s)
+        WHERE id = (
+            SELECT id
+            FROM mailings
+            WHERE 
+                (status = 'running' AND heartbeat_at < %s)
+                OR (
+                    status = 'pending' 
+                    AND NOT EXISTS (SELECT 1 FROM mailings WHERE status = 'running')
+                )
+            ORDER BY status = 'running' DESC, id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING {MAILING_COLUMNS}
+    """
+
+    params = (now, now, heartbeat_deadline)
+
+    try:
+        response: list = await fetch(query, params, fetch_type="one", as_dict=True)
+    except psycopg2.errors.UniqueViolation:
+        # Another worker started a mailing concurrently (mailings_single_running_idx)
+        response = []
+
+    try:
+        mailing: dict = response[0]
+    except IndexError:
+        mailing = None
+
+    return mailing
+
+
+async def setMailingRecipientsCount(mailing_id: int, recipients_count: int) -> None:
+    stmt = """
+        UPDATE mailings
+        SET recipients_count = %s
+        WHERE id = %s
+    """
+
+    params = (recipients_count, mailing_id)
+
+    await execute(stmt, params)
+
+
+async def setMailingProgress(mailing_id: int, last_user_id: int, delivery: dict) -> None:
+    """
+    Saves the resume point of the mailing together with the delivery counters of the last batch.
+
+    :param delivery: counters increments (`sent`, `failed`, `blocked`, `rate_limited`).
+    """
+
+    heartbeat_at: datetime = getCurrentDateTime()
+
+    stmt = """
+        UPDATE mailings
+        SET 
+            last_user_id = %s, 
+            heartbeat_at = %s,
+            sent_count = sent_count + %s,
+            failed_count = failed_count + %s,
+            blocked_count = blocked_count + %s,
+            rate_limited_count = rate_limited_count + %s
+        WHERE id = %s
+    """
+
+    params = (
+        last_user_id, 
+        heartbeat_at, 
+        delivery["sent"], 
+        delivery["failed"], 
+        delivery["blocked"], 
+        delivery["rate_limited"], 
+        mailing_id
+    )
+
+    await execute(stmt, params)
+
+
+async def setMailingCompleted(mailing_id: int) -> None:
+    finished_at: datetime = getCurrentDateTime()
+
+    stmt = """
+        UPDATE mailings
+        SET status = 'completed', finished_at = %s
+        WHERE id = %s
+    """
+
+    params = (finished_at, mailing_id)
+
+    await execute(stmt, params)
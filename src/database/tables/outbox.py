@@ -0,0 +1,106 @@
+import sys
+sys.path.append("../../") # src/
+
+from utils.common import getCurrentDateTime
+
+from database.aio import execute, fetch
+
+from datetime import datetime, timedelta
+
+
+async def claimOutboxEvents(batch_size: int, lease_seconds: int, max_attempts: int) -> list:
+    """
+    Locks up to `batch_size` of the oldest events ready to be dispatched for `lease_seconds` and returns them.
+    An event whose lease expired (its dispatcher crashed) is claimed again.
+    """
+
+    now: datetime = getCurrentDateTime()
+    locked_until: datetime = now + timedelta(seconds=lease_seconds)
+
+    query = """
+        UPDATE outbox
+        SET locked_until = %s, attempts = attempts + 1
+        WHERE id IN (
+            SELECT id
+            FROM outbox
+            WHERE 
+                processed_at IS NULL
+                AND available_at <= %s
+                AND (locked_until IS NULL OR locked_until < %s)
+                AND attempts < %s
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, event, payload, attempts, delivered_chat_ids
+    """
+
+    params = (locked_until, now, now, max_attempts, batch_size)
+
+    outbox_events: list = await fetch(query, params, fetch_type="all", as_dict=True)
+
+    return outbox_events
+
+
+async def setOutboxEventProcessed(outbox_event_id: int) -> None:
+    processed_at: datetime = getCurrentDateTime()
+
+    stmt = """
+        UPDATE outbox
+        SET processed_at = %s, locked_until = NULL, last_error = NULL
+        WHERE id = %s
+    """
+
+    params = (processed_at, outbox_event_id)
+
+    await execute(stmt, params)
+
+
+async def setOutboxEventFailed(
+    outbox_event_id: int, 
+    error: str, 
+    retry_after: int, 
+    delivered_chat_ids: list | None = None
+) -> None:
+    """
+    Releases the event to be dispatched again in `retry_after` seconds.
+
+    :param delivered_chat_ids: recepients who already received the event alert (kept as is if `None`).
+    """
+
+    available_at: datetime = getCurrentDateTime() + timedelta(seconds=retry_after)
+
+    stmt = """
+        UPDATE outbox
+        SET 
+            available_at = %s, 
+            locked_until = NULL, 
+            last_error = %s, 
+            delivered_chat_ids = COALESCE(%s::BIGINT[], delivered_chat_ids)
+        WHERE id = %s
+    """
+
+    params = (available_at, error, delivered_chat_ids, outbox_event_id)
+
+    await execute(stmt, params)
+
+
+async def deleteProcessedOutboxEvents(older_than_seconds: int) -> int:
+    "Deletes the events processed more than `older_than_seconds` ago, returns the number of deleted events."
+
+    processed_before: datetime = getCurrentDateTime() - timedelta(seconds=older_than_seconds)
+
+    query = """
+        WITH deleted AS (
+            DELETE FROM outbox
+            WHERE processed_at < %s
+            RETURNING 1
+        )
+        SELECT COUNT(*) FROM deleted
+    """
+
+    params = (processed_before,)
+
+    deleted_count: int = (await fetch(query, params, fetch_type="one"))[0]
+
+    return deleted_count
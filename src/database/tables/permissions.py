@@ -1,10 +1,10 @@
 import sys
 sys.path.append("../../") # src/
 
-from database import fetch
+from database.aio import fetch
 
 
-def getRolePermissions(role_id: int) -> list:
+async def getRolePermissions(role_id: int) -> list:
     query = """
         SELECT p.id, p.slug, p.name
         FROM roles_permissions rp
@@ -14,6 +14,21 @@ def getRolePermissions(role_id: int) -> list:
     """
     params = (role_id, )
 
-    permissions: list = fetch(query, params, fetch_type="all", as_dict=True)
+    permissions: list = await fetch(query, params, fetch_type="all", as_dict=True)
 
     return permissions
+
+
+async def getRolesPermissions() -> list:
+    "Returns the permissions of all the roles (`role_id`, `slug`)."
+
+    query = """
+        SELECT rp.role_id, p.slug
+        FROM roles_permissions rp
+        JOIN permissions p
+            ON rp.permission_id = p.id
+    """
+
+    roles_permissions: list = await fetch(query, fetch_type="all", as_dict=True)
+
+    return roles_permissions
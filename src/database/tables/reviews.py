@@ -3,31 +3,40 @@ sys.path.append("../../") # src/
 
 from utils.common import getCurrentDateTime
 
-from database import execute, fetch
+from database.aio import execute, fetch
 from database.utils import makeQueryConditions
 
 from datetime import datetime
 
 
-def createReview(user_id: int, car_service_id: int, text: str, rating: int) -> None:
+async def createReview(user_id: int, car_service_id: int, text: str, rating: int) -> None:
+    "Saves the review together with its `review_created` outbox event in the same statement."
+
     created_at: datetime = getCurrentDateTime()
 
     stmt = """
-        INSERT INTO reviews
-        (user_id, car_service_id, text, rating, created_at)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING id
+        WITH created AS (
+            INSERT INTO reviews
+            (user_id, car_service_id, text, rating, created_at)
+            VALUES (%s, %s, %s, %s, %s)
+            RETURNING id
+        ), outbox_event AS (
+            INSERT INTO outbox (event, payload, available_at, created_at)
+            SELECT 'review_created', json_build_object('review_id', id), %s, %s
+            FROM created
+        )
+        SELECT id FROM created
     """
     
-    params = (user_id, car_service_id, text, rating, created_at)
+    params = (user_id, car_service_id, text, rating, created_at, created_at, created_at)
 
-    new_row: tuple = execute(stmt, params, returning=True)
+    new_row: tuple = await execute(stmt, params, returning=True)
     
     review_id: int = new_row[0]
     return review_id
 
 
-def getReview(review_id: int) -> dict | None:
+async def getReview(review_id: int) -> dict | None:
     query = """
         SELECT id, user_id, car_service_id, text, rating, created_at
         FROM reviews
@@ -36,7 +45,35 @@ def getReview(review_id: int) -> dict | None:
 
     params = (review_id, )
 
-    response: list = fetch(query, params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
+
+    try:
+        review: dict = response[0]
+    except IndexError:
+        review = None
+
+    return review
+
+
+async def getReviewDetails(review_id: int) -> dict | None:
+    "Returns the review with `user_phone` and `car_service_name` joined in one query."
+
+    query = """
+        SELECT 
+            r.id, r.user_id, r.car_service_id, r.text, r.rating, r.created_at,
+            u.phone AS user_phone,
+            cs.name AS car_service_name
+        FROM reviews r
+        JOIN users u
+            ON u.id = r.user_id
+        JOIN car_services cs
+            ON cs.id = r.car_service_id
+        WHERE r.id = %s
+    """
+
+    params = (review_id, )
+
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
 
     try:
         review: dict = response[0]
@@ -46,7 +83,7 @@ def getReview(review_id: int) -> dict | None:
     return review
 
 
-def getUserReviews(user_id: int) -> list:
+async def getUserReviews(user_id: int) -> list:
     query = f"""
         SELECT id, user_id, car_service_id, text, rating, created_at
         FROM reviews
@@ -55,6 +92,6 @@ def getUserReviews(user_id: int) -> list:
 
     params = (user_id, )
 
-    user_reviews: list = fetch(query, params, fetch_type="all", as_dict=True)
+    user_reviews: list = await fetch(query, params, fetch_type="all", as_dict=True)
 
     return user_reviews
@@ -1,11 +1,11 @@
 import sys
 sys.path.append("../../") # src/
 
-from database import fetch
+from database.aio import fetch
 from database.utils import makeQueryConditions
 
 
-def getRole(role_id: int = None, role_slug: str = None) -> dict | None:
+async def getRole(role_id: int = None, role_slug: str = None) -> dict | None:
     if (not role_id) and (not role_slug):
         raise AttributeError("At least one argument must be passed")
 
@@ -18,7 +18,7 @@ def getRole(role_id: int = None, role_slug: str = None) -> dict | None:
         {conditions_string}
     """
 
-    response: list = fetch(query, conditions_params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, conditions_params, fetch_type="one", as_dict=True)
 
     try:
         role: dict = response[0]
@@ -26,3 +26,9 @@ def getRole(role_id: int = None, role_slug: str = None) -> dict | None:
         role = None
 
     return role
+
+
+async def getRoles() -> list:
+    query = "SELECT id, slug, name FROM roles"
+    roles: list = await fetch(query, fetch_type="all", as_dict=True)
+    return roles
@@ -0,0 +1,64 @@
+import sys
+sys.path.append("../../") # src/
+
+from database.aio import fetch
+
+from datetime import datetime
+
+
+def _makePeriodCondition(column: str, period: tuple[datetime, datetime] | None) -> tuple[str, tuple]:
+    "Generates a condition limiting the column date to the period (inclusive) and its parameters."
+
+    if not period:
+        return "", tuple()
+
+    start_datetime, end_datetime = period
+    condition = f"AND {column}::date BETWEEN %s AND %s"
+    params = (start_datetime.date(), end_datetime.date())
+    return condition, params
+
+
+async def _getDailyStats(counter: str, period: tuple[datetime, datetime] = None) -> list:
+    """
+    Sums a counter of the daily statistics rollup per car service and employee.
+
+    :param counter: `stats_daily` counter column.
+    """
+
+    period_condition, params = _makePeriodCondition("sd.day", period)
+
+    query = f"""
+        SELECT 
+            cs.id AS car_service_id, 
+            cs.name AS car_service_name, 
+            e.id AS employee_id, 
+            e.fullname AS employee_fullname, 
+            SUM(sd.{counter}) AS value
+        FROM stats_daily sd
+        JOIN car_services cs
+            ON cs.id = sd.car_service_id
+        JOIN employees e
+            ON e.id = sd.employee_id
+        WHERE 
+            sd.{counter} > 0
+            {period_condition}
+        GROUP BY cs.id, cs.name, e.id, e.fullname
+        ORDER BY cs.id, value DESC
+    """
+
+    stats: list = await fetch(query, params, fetch_type="all", as_dict=True)
+
+    return stats
+
+
+async def getCompletedFeedbackRequestsStats(period: tuple[datetime, datetime] = None) -> list:
+    "Returns the number of completed feedback requests per car service and employee."
+    return await _getDailyStats("completed_feedback_requests", period)
+
+
+async def getAddLinksActivationsStats(period: tuple[datetime, datetime] = None) -> list:
+    """
+    Returns the number of add links activations per car service and employee.
+    An employee is counted in the first of their car services, employees without car services are skipped.
+    """
+    return await _getDailyStats("add_link_activations", period)
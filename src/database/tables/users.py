@@ -3,13 +3,14 @@ sys.path.append("../../") # src/
 
 from utils.common import getCurrentDateTime
 
-from database import execute, fetch
+from database.aio import execute, fetch
 from database.utils import makeQueryConditions
 
 from datetime import datetime
+from typing import AsyncIterator
 
 
-def createUser(telegram_id: int, phone: str) -> None:
+async def createUser(telegram_id: int, phone: str) -> None:
     created_at: datetime = getCurrentDateTime()
     
     stmt = """
@@ -20,10 +21,10 @@ def createUser(telegram_id: int, phone: str) -> None:
 
     params = (telegram_id, phone, created_at)
 
-    execute(stmt, params)
+    await execute(stmt, params)
 
 
-def getUser(user_id: int = None, telegram_id: int = None) -> dict | None:
+async def getUser(user_id: int = None, telegram_id: int = None) -> dict | None:
     if (not user_id) and (not telegram_id):
         raise AttributeError("At least one argument must be passed")
 
@@ -36,7 +37,7 @@ def getUser(user_id: int = None, telegram_id: int = None) -> dict | None:
         {conditions_string}
     """
 
-    response: list = fetch(query, conditions_params, fetch_type="one", as_dict=True)
+    response: list = await fetch(query, conditions_params, fetch_type="one", as_dict=True)
 
     try:
         user: dict = response[0]
@@ -46,7 +47,83 @@ def getUser(user_id: int = None, telegram_id: int = None) -> dict | None:
     return user
 
 
-def getUsers() -> list:
+async def getUserWithEmployee(telegram_id: int) -> tuple[dict | None, dict | None]:
+    "Returns the user and their employee record (if any) loaded with one query."
+
+    query = """
+        SELECT 
+            u.id, u.telegram_id, u.phone, u.created_at,
+            e.id AS employee_id, e.role_id AS employee_role_id, 
+            e.fullname AS employee_fullname, e.created_at AS employee_created_at
+        FROM users u
+        LEFT JOIN employees e
+            ON e.user_id = u.id
+        WHERE u.telegram_id = %s
+    """
+
+    params = (telegram_id, )
+
+    response: list = await fetch(query, params, fetch_type="one", as_dict=True)
+    if not response:
+        return None, None
+
+    row: dict = response[0]
+    user = {
+        "id": row["id"], 
+        "telegram_id": row["telegram_id"], 
+        "phone": row["phone"], 
+        "created_at": row["created_at"],
+    }
+    if row["employee_id"] is None:
+        return user, None
+
+    employee = {
+        "id": row["employee_id"],
+        "user_id": row["id"],
+        "role_id": row["employee_role_id"],
+        "fullname": row["employee_fullname"],
+        "created_at": row["employee_created_at"],
+    }
+    return user, employee
+
+
+async def getUsers() -> list:
     query = "SELECT id, telegram_id, phone, created_at FROM users"
-    users: list = fetch(query, fetch_type="all", as_dict=True)
+    users: list = await fetch(query, fetch_type="all", as_dict=True)
     return users
+
+
+async def getUsersCount() -> int:
+    query = "SELECT COUNT(*) FROM users"
+    response: tuple = await fetch(query, fetch_type="one")
+    return response[0]
+
+
+async def iterUsersBatches(after_user_id: int = 0, batch_size: int = 100) -> AsyncIterator[list]:
+    """
+    Lazily iterates over the users in `id` order, yielding batches of `id` and `telegram_id` only.
+    Keyset pagination is used, so each batch is a separate short query and no connection is held between them.
+
+    :param after_user_id: users with `id` less than or equal to this value are skipped.
+    :param batch_size: maximum number of users in a batch.
+    """
+
+    query = """
+        SELECT id, telegram_id
+        FROM users
+        WHERE id > %s
+        ORDER BY id
+        LIMIT %s
+    """
+
+    while True:
+        params = (after_user_id, batch_size)
+        users: list = await fetch(query, params, fetch_type="all", as_dict=True)
+        if not users:
+            return
+
+        yield users
+
+        if len(users) < batch_size:
+            return
+        after_user_id: int = users[-1]["id"]
@@ -1,11 +1,124 @@
 from config import settings
 from logs import addLog
-from api.telegram import TelegramAPI
+from api.telegram import AsyncTelegramAPI
 
 from aiogram.types import Message, CallbackQuery
 
+import aiohttp
+import asyncio
 import traceback
 import functools
+import time
+
+
+ERRORS_AGGREGATION_SECONDS = 60 # the same error is logged at most once per this window
+ERROR_MESSAGE_COOLDOWN_SECONDS = 30 # the user is notified about errors at most once per this window
+
+# fingerprint -> (logged at, occurrences not logged since)
+errors_fingerprints: dict[tuple, tuple[float, int]] = {}
+# user telegram id -> notified at
+users_notified_at: dict[int, float] = {}
+
+errors_stats = {
+    "errors": 0,
+    "logged": 0,
+    "suppressed": 0,
+    "messages_sent": 0,
+    "messages_suppressed": 0,
+    "messages_failed": 0,
+}
+
+
+def getErrorsStats() -> dict:
+    "Returns the errors counters and the number of occurrences of each error fingerprint in the current window."
+
+    stats = dict(errors_stats)
+    stats["fingerprints"] = {
+        " ".join(map(str, fingerprint)): suppressed_count + 1
+        for fingerprint, (_, suppressed_count) in errors_fingerprints.items()
+    }
+    return stats
+
+
+def _makeErrorFingerprint(e: Exception) -> tuple:
+    "Returns the exception type and the place where it was raised."
+
+    frames: traceback.StackSummary = traceback.extract_tb(e.__traceback__)
+    if not frames:
+        return (type(e).__name__, )
+    frame: traceback.FrameSummary = frames[-1]
+    return (type(e).__name__, frame.filename, frame.lineno)
+
+
+def _logError(e: Exception) -> None:
+    "Logs the exception traceback unless the same error was already logged within `ERRORS_AGGREGATION_SECONDS`."
+
+    errors_stats["errors"] += 1
+    fingerprint: tuple = _makeErrorFingerprint(e)
+    now = time.monotonic()
+
+    logged_at, suppressed_count = errors_fingerprints.get(fingerprint, (None, 0))
+    if logged_at is not None and now - logged_at < ERRORS_AGGREGATION_SECONDS:
+        errors_fingerprints[fingerprint] = (logged_at, suppressed_count + 1)
+        errors_stats["suppressed"] += 1
+        return
+
+    log_text = f"{e}\n\n{''.join(traceback.format_exception(type(e), e, e.__traceback__))}"
+    if suppressed_count:
+        log_text += f"\nThe same error occurred {suppressed_count} more times since the previous log."
+    addLog(level="error", text=log_text)
+
+    errors_fingerprints[fingerprint] = (now, 0)
+    errors_stats["logged"] += 1
+
+
+def _canNotifyUser(user_id: int) -> bool:
+    "Checks whether the user can be notified about an error now (at most once per `ERROR_MESSAGE_COOLDOWN_SECONDS`)."
+
+    now = time.monotonic()
+    if len(users_notified_at) > 1000:
+        for notified_user_id, notified_at in list(users_notified_at.items()):
+            if now - notified_at >= ERROR_MESSAGE_COOLDOWN_SECONDS:
+                del users_notified_at[notified_user_id]
+
+    notified_at: float | None = users_notified_at.get(user_id)
+    if notified_at is not None and now - notified_at < ERROR_MESSAGE_COOLDOWN_SECONDS:
+        return False
+
+    users_notified_at[user_id] = now
+    return True
+
+
+async def reportException(e: Exception, user_id: int = None) -> None:
+    """
+    Logs the exception and tells the user about the unsuccessful request 
+    (aggregated, see `_logError()` and `_canNotifyUser()`).
+    """
+
+    _logError(e)
+
+    if not user_id:
+        return
+
+    if not _canNotifyUser(user_id):
+        errors_stats["messages_suppressed"] += 1
+        return
+
+    message_text = "*❌ Произошла неизвестная ошибка*"
+    telegram_api = AsyncTelegramAPI(settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_API_URL)
+    try:
+        await telegram_api.sendRequest(
+            request_method="POST",
+            api_method="sendMessage",
+            parameters={
+                "chat_id": user_id,
+                "text": message_text,
+                "parse_mode": "Markdown",
+            },
+        )
+        errors_stats["messages_sent"] += 1
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        errors_stats["messages_failed"] += 1
 
 
 def exceptions_catcher(): 
@@ -13,6 +126,7 @@ def exceptions_catcher():
     Catches all the exceptions in functions.
     If exception is noticed, it adds a new note to a logfile 
     and sends a telegram message for user about unsuccessful request.
+    Repeated errors and messages are aggregated (see `reportException()`).
     """
 
     def container(func):
@@ -27,21 +141,7 @@ def exceptions_catcher():
             try:
                 result = await func(*args, **kwargs)
             except Exception as e:
-                log_text = f"{e}\n\n{traceback.format_exc()}"
-                addLog(level="error", text=log_text)
-
-                if user_id:                 
-                    message_text = "*❌ Произошла неизвестная ошибка*"
-                    telegram_api = TelegramAPI(settings.TELEGRAM_BOT_TOKEN)
-                    telegram_api.sendRequest(
-                        request_method="POST",
-                        api_method="sendMessage",
-                        parameters={
-                            "chat_id": user_id,
-                            "text": message_text,
-                            "parse_mode": "Markdown",
-                        },
-                    )
-                    
+                await reportException(e, user_id)
+
         return wrapper
     return container
@@ -0,0 +1,138 @@
+"""
+Fake Telegram sender for the webhook mode (webhook.py).
+
+    python fake_telegram.py send --url http://127.0.0.1:8080 --chat-id 1 --text /start
+        posts a message update to a running bot, like Telegram does.
+
+    python fake_telegram.py check --chats 20 --messages 50
+        posts interleaved updates of several chats to an in-process webhook app
+        and checks that the updates of each chat are handled in the order they were sent.
+"""
+
+from config import settings
+from webhook import SECRET_TOKEN_HEADER, UpdatesWorkerPool, makeWebhookApp
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message
+from aiohttp.test_utils import TestServer
+
+import aiohttp
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+
+FAKE_BOT_TOKEN = "123456:fake-telegram-token"
+
+update_ids = itertools.count(1)
+
+
+def makeMessageUpdate(chat_id: int, text: str) -> dict:
+    "Returns the JSON of a private chat text message update."
+
+    update_id: int = next(update_ids)
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private", "first_name": "Fake"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Fake"},
+            "text": text,
+        },
+    }
+
+
+async def sendUpdate(session: aiohttp.ClientSession, url: str, update: dict) -> None:
+    "Posts the update with the secret token header, raises if the webhook didn't accept it."
+
+    headers: dict = {SECRET_TOKEN_HEADER: settings.WEBHOOK_SECRET} if settings.WEBHOOK_SECRET else {}
+    async with session.post(url.rstrip("/") + settings.WEBHOOK_PATH, json=update, headers=headers) as response:
+        response.raise_for_status()
+
+
+async def runSend(url: str, chat_id: int, text: str) -> None:
+    async with aiohttp.ClientSession() as session:
+        await sendUpdate(session, url, makeMessageUpdate(chat_id, text))
+
+
+async def runOrderingCheck(chats_count: int, messages_count: int, workers_count: int) -> bool:
+    """
+    Sends `messages_count` numbered messages from each of `chats_count` chats concurrently
+    (one at a time per chat, as Telegram does) while the handler sleeps a random time,
+    and returns whether every chat received its messages in order.
+    """
+
+    handled: dict[int, list] = {}
+
+    router = Router()
+
+    @router.message()
+    async def recordMessage(message: Message) -> None:
+        await asyncio.sleep(random.uniform(0, 0.01))
+        handled.setdefault(message.chat.id, []).append(int(message.text))
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    bot = Bot(token=FAKE_BOT_TOKEN)
+
+    workers_pool = UpdatesWorkerPool(dp=dp, bot=bot, workers_count=workers_count)
+    server = TestServer(makeWebhookApp(bot, workers_pool))
+
+    await server.start_server()
+    workers_pool.start()
+    try:
+        url: str = str(server.make_url("/"))
+
+        async def sendChatMessages(session: aiohttp.ClientSession, chat_id: int) -> None:
+            for number in range(messages_count):
+                await sendUpdate(session, url, makeMessageUpdate(chat_id, str(number)))
+
+        async with aiohttp.ClientSession() as session:
+            await asyncio.gather(*(sendChatMessages(session, chat_id) for chat_id in range(1, chats_count + 1)))
+    finally:
+        await workers_pool.stop()
+        await server.close()
+        await bot.session.close()
+
+    expected = list(range(messages_count))
+    unordered_chats: list = [
+        chat_id for chat_id in range(1, chats_count + 1) if handled.get(chat_id) != expected
+    ]
+    for chat_id in unordered_chats:
+        print(f"Chat {chat_id}: {handled.get(chat_id)}")
+
+    print(
+        f"{chats_count * messages_count} updates of {chats_count} chats handled by {workers_count} workers, "
+        + f"{len(unordered_chats)} chats out of order."
+    )
+    return not unordered_chats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Telegram sender for the bot webhook.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    send_parser = commands.add_parser("send", help="post a message update to a running bot")
+    send_parser.add_argument("--url", default=f"http://127.0.0.1:{settings.WEBHOOK_PORT}")
+    send_parser.add_argument("--chat-id", type=int, required=True)
+    send_parser.add_argument("--text", required=True)
+
+    check_parser = commands.add_parser("check", help="check the same chat updates ordering")
+    check_parser.add_argument("--chats", type=int, default=20)
+    check_parser.add_argument("--messages", type=int, default=50)
+    check_parser.add_argument("--workers", type=int, default=settings.WEBHOOK_WORKERS)
+
+    args = parser.parse_args()
+    if args.command == "send":
+        asyncio.run(runSend(args.url, args.chat_id, args.text))
+        return
+
+    if not asyncio.run(runOrderingCheck(args.chats, args.messages, args.workers)):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,11 @@ import sys
 sys.path.append("../") # src/
 
 from add_links import add_link_checker
-from access import access_checker, hasEmployeeAccess
+from access import access_checker
 from exceptions import exceptions_catcher
 from states import makeNextStateCallback
 from utils.common import respondEvent, getUserName, makeGreetingMessage
 
-from database.tables.users import getUser
-from database.tables.employees import getEmployee
-
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import CommandStart, StateFilter
@@ -26,14 +23,15 @@ router = Router(name=__name__)
 @exceptions_catcher()
 @add_link_checker()
 @access_checker()
-async def start(event: Message | CallbackQuery, state: FSMContext) -> None:
+async def start(
+    event: Message | CallbackQuery, 
+    state: FSMContext, 
+    employee: dict | None, 
+    permissions: frozenset
+) -> None:
     await state.clear()
 
     telegram_user: User = event.from_user
-    telegram_id: int = telegram_user.id
-    user: dict = getUser(telegram_id=telegram_id)
-    user_id: int = user["id"]
-    employee: dict | None = getEmployee(user_id=user_id)
 
     greeting: str = makeGreetingMessage()
     user_name: str = getUserName(user=telegram_user)
@@ -50,17 +48,17 @@ async def start(event: Message | CallbackQuery, state: FSMContext) -> None:
     
     # Employees buttons
     if employee:
-        if hasEmployeeAccess(employee, required_permissions=["add_user"]):
+        if "add_user" in permissions:
             keyboard.button(
                 text="➕ Добавить пользователя", 
                 callback_data=makeNextStateCallback(event, "add_user", is_start=True)
             )                
-        if hasEmployeeAccess(employee, required_permissions=["add_mailing"]):
+        if "add_mailing" in permissions:
             keyboard.button(
                 text="✉️ Запустить рассылку", 
                 callback_data=makeNextStateCallback(event, "add_mailing", is_start=True)
             )        
-        if hasEmployeeAccess(employee, required_permissions=["process_feedback_request"]):
+        if "process_feedback_request" in permissions:
             keyboard.button(
                 text="📬 Запросы обратной связи", 
                 callback_data=makeNextStateCallback(
@@ -70,7 +68,7 @@ async def start(event: Message | CallbackQuery, state: FSMContext) -> None:
                     is_start=True
                 )
             )        
-        if hasEmployeeAccess(employee, required_permissions=["get_stats"]):
+        if "get_stats" in permissions:
             keyboard.button(
                 text="📊 Статистика", 
                 callback_data=makeNextStateCallback(event, "stats", is_start=True)
@@ -1,7 +1,7 @@
 import sys
 sys.path.append("../") # src/
 
-from access import access_checker, hasEmployeeAccess
+from access import access_checker
 from exceptions import exceptions_catcher
 from states import makeNextStateCallback, makePrevStateCallback, reduceStateData
 from utils.common import respondEvent, getCallParams, getCurrentDateTime
@@ -9,18 +9,18 @@ from utils.feedback import makeFeedbackRequestMessage
 from utils.pagination import Paginator
 
 from database.tables.feedback_requests import (
-    getFeedbackRequest, 
-    getFeedbackRequests, 
+    getFeedbackRequestDetails, 
+    getActiveFeedbackRequestsPage, 
     setFeedbackRequestTaken, 
     setFeedbackRequestCompleted,
     getLastUserFeedbackRequest
 )
-from database.tables.employees import getEmployee
-from database.tables.users import getUser
-from database.tables.car_services import getEmployeeCarServices
 
 from handlers.forms.add_feedback_request_form import start_add_feedback_request_form
 
+from modules.stats import invalidateStatsCache
+from modules.outbox import wakeOutboxDispatcher
+
 from aiogram import Router, F, Bot
 from aiogram.types import  CallbackQuery
 from aiogram.utils.keyboard import InlineKeyboardBuilder
@@ -64,13 +64,13 @@ async def feedback(event: CallbackQuery, state: FSMContext) -> None:
 @router.callback_query(F.data.endswith("add_feedback_request/"))
 @exceptions_catcher()
 @access_checker()
-async def add_feedback_request(event: CallbackQuery, state: FSMContext, bot: Bot) -> None:
+async def add_feedback_request(event: CallbackQuery, state: FSMContext, bot: Bot, user: dict) -> None:
     await state.clear()
 
     telegram_id: int = event.from_user.id
-    user_id: int = getUser(telegram_id=telegram_id)["id"]
+    user_id: int = user["id"]
 
-    feedback_request: dict = getLastUserFeedbackRequest(user_id)
+    feedback_request: dict = await getLastUserFeedbackRequest(user_id)
     if feedback_request:
         now: datetime = getCurrentDateTime().replace(tzinfo=None)
         created_at: datetime = feedback_request["created_at"]
@@ -90,11 +90,16 @@ async def add_feedback_request(event: CallbackQuery, state: FSMContext, bot: Bot
 )
 @exceptions_catcher()
 @access_checker()
-async def feedback_requests_list(event: CallbackQuery, state: FSMContext) -> None:
+async def feedback_requests_list(
+    event: CallbackQuery, 
+    state: FSMContext, 
+    user: dict, 
+    employee: dict | None, 
+    permissions: frozenset
+) -> None:
     await state.clear()
 
-    telegram_id: int = event.from_user.id
-    user_id: int = getUser(telegram_id=telegram_id)["id"]
+    user_id: int = user["id"]
 
     call_params: dict = getCallParams(event)
     try:
@@ -102,27 +107,37 @@ async def feedback_requests_list(event: CallbackQuery, state: FSMContext) -> Non
     except KeyError:
         list_view: str = "user"
 
+    try:
+        page = int(call_params["page"])
+    except KeyError:
+        page = 1
+
+    page_size = 5
+
     if list_view == "user":
-        feedback_requests: list = getFeedbackRequests(user_id=user_id, completed_at_is_null=True)
-    elif list_view == "employee":
-        employee: dict | None = getEmployee(user_id=user_id)
-        if employee and hasEmployeeAccess(employee, required_permissions=["process_feedback_request"]):
-            employee_id: int = employee["id"]
-            employee_car_services: int = getEmployeeCarServices(employee_id=employee_id)
-            feedback_requests = []
-            for car_service in employee_car_services:
-                feedback_requests.extend(
-                    getFeedbackRequests(car_service_id=car_service["car_service_id"], completed_at_is_null=True)
-                )
-            for feedback_request in feedback_requests:
-                feedback_request_employee_id: int | None = feedback_request["employee_id"]
-                if feedback_request_employee_id and feedback_request_employee_id != employee_id:
-                    feedback_requests.remove(feedback_request)
+        feedback_requests_filter = {"user_id": user_id}
+    elif employee and "process_feedback_request" in permissions:
+        feedback_requests_filter = {"employee_id": employee["id"]}
+    else:
+        feedback_requests_filter = None
+
+    if feedback_requests_filter:
+        feedback_requests, feedback_requests_count = await getActiveFeedbackRequestsPage(
+            **feedback_requests_filter, limit=page_size, offset=page_size * (page - 1)
+        )
+        # The requested page may no longer exist if requests were completed meanwhile
+        if not feedback_requests and feedback_requests_count == 0 and page > 1:
+            page = 1
+            feedback_requests, feedback_requests_count = await getActiveFeedbackRequestsPage(
+                **feedback_requests_filter, limit=page_size, offset=0
+            )
+    else:
+        feedback_requests, feedback_requests_count = [], 0
 
     message_text = (
         "*🗃 Список запросов*" + "\n\n"
         + (
-            f"⏳ Активных запросов: *{len(feedback_requests)}*" if feedback_requests 
+            f"⏳ Активных запросов: *{feedback_requests_count}*" if feedback_requests 
             else "🔎 Нет ни одного активного запроса"
         )
     )
@@ -132,7 +147,7 @@ async def feedback_requests_list(event: CallbackQuery, state: FSMContext) -> Non
         for feedback_request in feedback_requests:
             feedback_request_id: int = feedback_request["id"]
 
-            phone: str = getUser(user_id=feedback_request["user_id"])["phone"]
+            phone: str = feedback_request["user_phone"]
             request_reason: str = feedback_request["request_reason"]
             created_at_date: datetime = feedback_request["created_at"].date()
 
@@ -156,16 +171,12 @@ async def feedback_requests_list(event: CallbackQuery, state: FSMContext) -> Non
                 )
             })
 
-        try:
-            page = int(call_params["page"])
-        except KeyError:
-            page = 1
-
         paginator = Paginator(
             array=feedback_requests_keyboard_items,
-            offset=5,
+            offset=page_size,
             page_callback=makeNextStateCallback(event, reduceStateData("feedback_requests_list")),
-            back_callback=makePrevStateCallback(event)
+            back_callback=makePrevStateCallback(event),
+            items_count=feedback_requests_count
         )
         keyboard: InlineKeyboardBuilder = paginator.makePageKeyboard(page=page)
     elif not feedback_requests:
@@ -187,18 +198,21 @@ async def feedback_requests_list(event: CallbackQuery, state: FSMContext) -> Non
 )
 @exceptions_catcher()
 @access_checker()
-async def feedback_request_card(event: CallbackQuery, state: FSMContext, bot: Bot) -> None:
+async def feedback_request_card(
+    event: CallbackQuery, 
+    state: FSMContext, 
+    employee: dict | None, 
+    permissions: frozenset
+) -> None:
     await state.clear()
 
-    telegram_id: int = event.from_user.id
-
     call_params: dict = getCallParams(event)
     try:
         feedback_request_id = int(call_params["feedback_request_id"])
     except KeyError:
         feedback_request_id = int(call_params[reduceStateData("feedback_request_id")])
 
-    feedback_request: dict | None = getFeedbackRequest(feedback_request_id)
+    feedback_request: dict | None = await getFeedbackRequestDetails(feedback_request_id)
     feedback_request_message: str = makeFeedbackRequestMessage(feedback_request)
 
     message_text = (
@@ -208,9 +222,7 @@ async def feedback_request_card(event: CallbackQuery, state: FSMContext, bot: Bo
 
     keyboard = InlineKeyboardBuilder()
 
-    user_id: int = getUser(telegram_id=telegram_id)["id"]
-    employee: dict | None = getEmployee(user_id=user_id)
-    if employee and hasEmployeeAccess(employee, required_permissions=["process_feedback_request"]):
+    if employee and "process_feedback_request" in permissions:
         if (feedback_request["employee_id"] is None) or (feedback_request["employee_id"] == employee["id"]):
             if not feedback_request["taken_at"]:
                 keyboard.button(
@@ -239,27 +251,24 @@ async def feedback_request_card(event: CallbackQuery, state: FSMContext, bot: Bo
 @router.callback_query(F.data.split("?")[0].endswith("take_feedback_request/"))
 @exceptions_catcher()
 @access_checker(required_permissions=["process_feedback_request"])
-async def take_feedback_request(event: CallbackQuery, state: FSMContext, bot: Bot) -> None:
+async def take_feedback_request(event: CallbackQuery, state: FSMContext, employee: dict) -> None:
     await state.clear()
 
     call_params: dict = getCallParams(event)
     feedback_request_id: int = call_params["feedback_request_id"]
 
-    feedback_request: dict | None = getFeedbackRequest(feedback_request_id)
+    feedback_request: dict | None = await getFeedbackRequestDetails(feedback_request_id)
     if not feedback_request:
         return await respondEvent(event, text="*❌ Запрос на обратную связь не найден*", parse_mode="Markdown")
 
-    employee_telegram_id: int = event.from_user.id
-    employee_user_id: int = getUser(telegram_id=employee_telegram_id)["id"]
-    employee_id: int = getEmployee(user_id=employee_user_id)["id"]
+    employee_id: int = employee["id"]
 
     current_employee_id: int = feedback_request["employee_id"]
     taken_at: datetime = feedback_request["taken_at"]
     if current_employee_id:
         message_text = None
         if current_employee_id != employee_id:
-            employee: dict = getEmployee(employee_id=current_employee_id)
-            employee_fullname: str = employee["fullname"]
+            employee_fullname: str = feedback_request["employee_fullname"]
             message_text = f"* ❌ Данный запрос на обратную связь уже принял в работу: {employee_fullname}*"
         elif taken_at and (current_employee_id == employee_id):
             message_text = f"* ❌ Вы уже приняли данный запрос в работу*"
@@ -270,12 +279,13 @@ async def take_feedback_request(event: CallbackQuery, state: FSMContext, bot: Bo
                 parse_mode="Markdown"
             )
 
-    setFeedbackRequestTaken(
+    await setFeedbackRequestTaken(
         feedback_request_id=feedback_request_id, 
         employee_id=employee_id
     )
+    wakeOutboxDispatcher()
 
-    feedback_request: dict | None = getFeedbackRequest(feedback_request_id)
+    feedback_request.update(employee_id=employee_id, employee_fullname=employee["fullname"])
     feedback_request_message: str = makeFeedbackRequestMessage(feedback_request)
 
     # Employee message
@@ -295,14 +305,6 @@ async def take_feedback_request(event: CallbackQuery, state: FSMContext, bot: Bo
         reply_markup=employee_message_keyboard.as_markup()
     )
 
-    # User message
-    user_telegram_id: int = getUser(user_id=feedback_request["user_id"])["telegram_id"]
-    user_message_text = (
-        f"*⏳ Ваш запрос на обратную связь принят в работу*" + "\n\n"
-        + feedback_request_message
-    )
-    await bot.send_message(chat_id=user_telegram_id, text=user_message_text, parse_mode="Markdown")
-
 
 @router.callback_query(F.data.split("?")[0].endswith("complete_feedback_request/"))
 @exceptions_catcher()
@@ -313,7 +315,7 @@ async def complete_feedback_request(event: CallbackQuery, state: FSMContext, bot
     call_params: dict = getCallParams(event)
     feedback_request_id: int = call_params["feedback_request_id"]
 
-    feedback_request: dict | None = getFeedbackRequest(feedback_request_id)
+    feedback_request: dict | None = await getFeedbackRequestDetails(feedback_request_id)
     if not feedback_request:
         return await respondEvent(event, text="*❌ Запрос на обратную связь не найден*", parse_mode="Markdown")
 
@@ -325,7 +327,8 @@ async def complete_feedback_request(event: CallbackQuery, state: FSMContext, bot
             parse_mode="Markdown"
         )
 
-    setFeedbackRequestCompleted(feedback_request_id=feedback_request_id)
+    await setFeedbackRequestCompleted(feedback_request_id=feedback_request_id)
+    await invalidateStatsCache("feedback_requests")
 
     feedback_request_message: str = makeFeedbackRequestMessage(feedback_request)
 
@@ -338,7 +341,7 @@ async def complete_feedback_request(event: CallbackQuery, state: FSMContext, bot
     await respondEvent(event, text=employee_message_text, parse_mode="Markdown")
 
     # User message
-    user_telegram_id: int = getUser(user_id=feedback_request["user_id"])["telegram_id"]
+    user_telegram_id: int = feedback_request["user_telegram_id"]
     user_message_text = (
         f"*☑️ Ваш запрос на обратную связь отмечен сотрудником как выполненный*" + "\n\n"
         + feedback_request_message
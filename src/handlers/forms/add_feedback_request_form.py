@@ -3,23 +3,20 @@ sys.path.append("../../") # src/
 
 from config import settings
 
-from access import access_checker
+from access import access_checker, getEventUser
 from exceptions import exceptions_catcher
 from states import makeNextStateCallback, makePrevStateCallback, updateEventState
 from utils.common import respondEvent, getCallParams, getCurrentDateTime, isDateInRange
 from utils.forms import makeFormStateMessage
 from utils.keyboard import makeItemsKeyboard
 from utils.views import shortenFullname
-from cache import setCacheValue, getCacheValue, DAY_SECONDS
+from cache import getOrSetCacheValue, makeCacheKey, DAY_SECONDS
+from references import getReferences, getRoleID
 
-from database.tables.car_services import getCarServices
-from database.tables.roles import getRole
 from database.tables.employees import getCarServiceEmployees
-from database.tables.contact_methods import getContactMethods
-from database.tables.users import getUser
 from database.tables.feedback_requests import createFeedbackRequest
 
-from modules.feedback import alertFeedbackRequested
+from modules.outbox import wakeOutboxDispatcher
 
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
@@ -71,12 +68,7 @@ async def feedback_request_car_service_state(event: CallbackQuery, state: FSMCon
         + "🏎 Выберите автосервис в который хотите обратиться"
     )
 
-    car_services: str | None = getCacheValue(key="car_services")
-    if car_services:
-        car_services: list = json.loads(car_services)
-    else:
-        car_services: list = getCarServices()
-        setCacheValue(key="car_services", value=json.dumps(car_services), expire=DAY_SECONDS)
+    car_services: tuple = getReferences().car_services
 
     keyboard: InlineKeyboardBuilder = makeItemsKeyboard(
         items_buttons=[
@@ -128,18 +120,15 @@ async def feedback_request_employee_state(event: CallbackQuery, state: FSMContex
 
     state_data: dict = await state.get_data()
     car_service_id: int = state_data["car_service"]["value"]
-    manager_role_id: int = getRole(role_slug="manager")["id"]
-
-    employees: str | None = getCacheValue(key=f"employees?role_slug=manager&car_service_id={car_service_id}")
-    if employees:
-        employees: list = json.loads(employees)
-    else:
-        employees: list = getCarServiceEmployees(car_service_id=car_service_id, role_id=manager_role_id)
-        setCacheValue(
-            key=f"employees?role_slug=manager&car_service_id={car_service_id}", 
-            value=json.dumps(employees), 
-            expire=DAY_SECONDS
-        )
+    manager_role_id: int = await getRoleID("manager")
+
+    employees: list = await getOrSetCacheValue(
+        key=makeCacheKey("employees", role_slug="manager", car_service_id=car_service_id),
+        loader=lambda: getCarServiceEmployees(car_service_id=car_service_id, role_id=manager_role_id),
+        expire=DAY_SECONDS,
+        local=True,
+        tags=("employees",)
+    )
 
     keyboard: InlineKeyboardBuilder = makeItemsKeyboard(
         items_buttons=[
@@ -198,12 +187,7 @@ async def feedback_request_contact_method_state(event: CallbackQuery, state: FSM
         + "☎️ Выберите предпочтительный способ обратной связи или пропустите данный шаг"
     )
 
-    contact_methods: str | None = getCacheValue(key="contact_methods")
-    if contact_methods:
-        contact_methods: list = json.loads(contact_methods)
-    else:
-        contact_methods: list = getContactMethods()
-        setCacheValue(key="contact_methods", value=json.dumps(contact_methods), expire=DAY_SECONDS)
+    contact_methods: tuple = getReferences().contact_methods
 
     keyboard: InlineKeyboardBuilder = makeItemsKeyboard(
         items_buttons=[
@@ -308,11 +292,10 @@ async def commit_add_feedback_request_form(event: Message | CallbackQuery, state
     keyboard = InlineKeyboardBuilder()
 
     if isinstance(event, CallbackQuery) and event.data == "commit_add_feedback_request_form":
-        telegram_id: int = event.from_user.id
-        user_id: int = getUser(telegram_id=telegram_id)["id"]
+        user_id: int = (await getEventUser(event))["id"]
         feedback_request_data: dict = await state.get_data()
         
-        feedback_request_id: int = createFeedbackRequest(
+        feedback_request_id: int = await createFeedbackRequest(
             user_id=user_id,
             car_service_id=feedback_request_data["car_service"]["value"],
             employee_id=feedback_request_data["employee"]["value"],
@@ -320,7 +303,7 @@ async def commit_add_feedback_request_form(event: Message | CallbackQuery, state
             request_reason=feedback_request_data["request_reason"]["value"],
         )
 
-        alertFeedbackRequested(feedback_request_id)
+        wakeOutboxDispatcher()
         
         message_heading = "*✅ Запрос обратной связи отправлен*"
         keyboard.button(text="📞 Вернуться в меню", callback_data="feedback/")
@@ -3,14 +3,13 @@ sys.path.append("../../") # src/
 
 from config import settings
 
-from access import access_checker
+from access import access_checker, getEventEmployee
 from exceptions import exceptions_catcher
 from utils.common import respondEvent, getCallParams, getCurrentDateTime
 from utils.forms import makeFormStateMessage
 from utils.keyboard import makeItemsKeyboard
-from cache import setCacheValue, getCacheValue, DAY_SECONDS
 
-from modules.mailing import sendMailing
+from modules.mailing import enqueueMailing
 
 from aiogram import Router, F, Bot
 from aiogram.types import Message, CallbackQuery
@@ -122,7 +121,7 @@ async def mailing_image_state(event: Message, state: FSMContext) -> None:
 @router.callback_query(Mailing.image)
 @exceptions_catcher()
 @access_checker(required_permissions=["add_mailing"])
-async def mailing_image_process(event: Message | CallbackQuery, state: FSMContext, bot: Bot) -> None:
+async def mailing_image_process(event: Message | CallbackQuery, state: FSMContext) -> None:
     if isinstance(event, CallbackQuery) and event.data == "skip":
         await state.update_data(image={"value": None})
         return await commit_add_mailing_form(event, state)
@@ -137,33 +136,32 @@ async def mailing_image_process(event: Message | CallbackQuery, state: FSMContex
         )
         return await mailing_image_state(event, state)
 
-    image_id: str = image.file_id
-    image_name = f"{image_id}.jpg"    
-    image_path = f"media/temporary/mailing/{image_name}"
-    await bot.download(file=image_id, destination=image_path)
+    image_file_id: str = image.file_id
 
-    await state.update_data(image={"value": image_path, "view": "добавлено"})
+    await state.update_data(image={"value": image_file_id, "view": "добавлено"})
     await commit_add_mailing_form(event, state)
 
 
 
 @router.callback_query(F.data == "commit_add_mailing_form")
 @exceptions_catcher()
-@access_checker()
+@access_checker(required_permissions=["add_mailing"])
 async def commit_add_mailing_form(event: Message | CallbackQuery, state: FSMContext) -> None:
     await state.set_state(None)
 
     form_state_message: str = await makeFormStateMessage(Mailing, state)
 
     keyboard = InlineKeyboardBuilder()
+    mailing = None
 
     if isinstance(event, CallbackQuery) and event.data == "commit_add_mailing_form":
+        employee_id: int = (await getEventEmployee(event))["id"]
+
         mailing_data: dict = await state.get_data()
         mailing = {
             "text": mailing_data["text"]["value"],
-            "image_path": mailing_data["image"]["value"],
+            "image_file_id": mailing_data["image"]["value"],
         }
-        sendMailing(mailing)
 
         message_heading = "*📨 Процесс отправки сообщений запущен.*"
         await state.clear()
@@ -179,10 +177,19 @@ async def commit_add_mailing_form(event: Message | CallbackQuery, state: FSMCont
         + form_state_message
     )
 
-    await respondEvent(
+    message_id: int = await respondEvent(
         event,
         text=message_text,
         parse_mode="Markdown",
         reply_markup=keyboard.as_markup()
     )
 
+    # The sent message becomes the live delivery report of the mailing
+    if mailing:
+        await enqueueMailing(
+            employee_id, 
+            mailing, 
+            status_chat_id=event.from_user.id, 
+            status_message_id=message_id
+        )
+
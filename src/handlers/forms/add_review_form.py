@@ -3,18 +3,16 @@ sys.path.append("../../") # src/
 
 from config import settings
 
-from access import access_checker
+from access import access_checker, getEventUser
 from exceptions import exceptions_catcher
 from utils.common import respondEvent, getCallParams, getCurrentDateTime
 from utils.forms import makeFormStateMessage
 from utils.keyboard import makeItemsKeyboard
-from cache import setCacheValue, getCacheValue, DAY_SECONDS
+from references import getReferences, getCarService
 
-from database.tables.car_services import getCarServices, getCarService
-from database.tables.users import getUser
 from database.tables.reviews import getUserReviews, createReview
 
-from modules.reviews import alertReviewAdded
+from modules.outbox import wakeOutboxDispatcher
 
 from aiogram import Router, F, Bot
 from aiogram.types import Message, CallbackQuery
@@ -64,12 +62,7 @@ async def review_car_service_state(event: CallbackQuery, state: FSMContext) -> N
         + "🏎 Выберите автосервис работу которого хотите оценить"
     )
 
-    car_services: str | None = getCacheValue(key="car_services")
-    if car_services:
-        car_services: list = json.loads(car_services)
-    else:
-        car_services: list = getCarServices()
-        setCacheValue(key="car_services", value=json.dumps(car_services), expire=DAY_SECONDS)
+    car_services: tuple = getReferences().car_services
 
     keyboard: InlineKeyboardBuilder = makeItemsKeyboard(
         items_buttons=[
@@ -94,15 +87,14 @@ async def review_car_service_state(event: CallbackQuery, state: FSMContext) -> N
 @router.callback_query(Review.car_service)
 @exceptions_catcher()
 @access_checker()
-async def review_car_service_process(event: CallbackQuery, state: FSMContext) -> None:
+async def review_car_service_process(event: CallbackQuery, state: FSMContext, user: dict) -> None:
     call_params: dict = getCallParams(event)
     car_service_id = int(call_params["id"])
     car_service_name = call_params["name"]
 
-    telegram_id: int = event.from_user.id
-    user_id: int = getUser(telegram_id=telegram_id)["id"]
+    user_id: int = user["id"]
 
-    user_reviews: dict = getUserReviews(user_id=user_id)
+    user_reviews: dict = await getUserReviews(user_id=user_id)
     for review in user_reviews:
         if car_service_id == review["car_service_id"]:
             await state.clear()
@@ -112,7 +104,7 @@ async def review_car_service_process(event: CallbackQuery, state: FSMContext) ->
                 + "🤩 Но Вы также всегда можете поставить нам оценку на *Яндекс.Картах*!"
             )
 
-            car_service: dict = getCarService(car_service_id)
+            car_service: dict = await getCarService(car_service_id)
             car_service_yandex_maps_url: str = car_service["yandex_maps_url"]
 
             keyboard = InlineKeyboardBuilder()
@@ -237,21 +229,20 @@ async def commit_add_review_form(event: Message | CallbackQuery, state: FSMConte
     keyboard = InlineKeyboardBuilder()
 
     if isinstance(event, CallbackQuery) and event.data == "commit_add_review_form":
-        telegram_id: int = event.from_user.id
-        user_id: int = getUser(telegram_id=telegram_id)["id"]
+        user_id: int = (await getEventUser(event))["id"]
         review_data: dict = await state.get_data()
 
         car_service_id: int = review_data["car_service"]["value"]
-        car_service: dict = getCarService(car_service_id)
+        car_service: dict = await getCarService(car_service_id)
         car_service_yandex_maps_url: str = car_service["yandex_maps_url"]
         
-        review_id: int = createReview(
+        review_id: int = await createReview(
             user_id=user_id,
             car_service_id=car_service_id,
             text=review_data["text"]["value"],
             rating=review_data["rating"]["value"]
         )
-        alertReviewAdded(review_id)
+        wakeOutboxDispatcher()
         
         message_heading = "*🎉 Отзыв сохранён. Спасибо, каждая оценка очень важна для нас!*"
         yandex_review_message = (
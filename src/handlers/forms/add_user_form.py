@@ -3,12 +3,10 @@ sys.path.append("../../") # src/
 
 from config import settings
 
-from access import access_checker
+from access import access_checker, getEventEmployee
 from exceptions import exceptions_catcher
 from utils.common import respondEvent, generateQRCode, removeFile
 
-from database.tables.users import getUser
-from database.tables.employees import getEmployee
 from database.tables.add_links import createAddLink
 
 from aiogram import Router, F
@@ -77,10 +75,7 @@ async def user_phone_process(event: Message, state: FSMContext) -> None:
 @exceptions_catcher()
 @access_checker(required_permissions=["add_user"])
 async def commit_add_user_form(event: CallbackQuery, state: FSMContext) -> None:
-    telegram_id: int = event.from_user.id
-    user: dict = getUser(telegram_id=telegram_id)
-    user_id: int = user["id"]
-    employee: dict = getEmployee(user_id=user_id)
+    employee: dict = await getEventEmployee(event)
     employee_id: int = employee["id"]
 
     user_data = await state.get_data()
@@ -88,7 +83,7 @@ async def commit_add_user_form(event: CallbackQuery, state: FSMContext) -> None:
 
     add_link_id = str(uuid.uuid4())
     data = {"phone": user_phone}
-    createAddLink(
+    await createAddLink(
         add_link_id=add_link_id,
         employee_id=employee_id,
         data=data,
@@ -7,7 +7,8 @@ from states import makeNextStateCallback, makePrevStateCallback
 from utils.common import respondEvent, getCallParams, makePeriodDatetimes
 from utils.keyboard import makeItemsKeyboard
 
-from modules.stats import STATS_BLOCKS, StatsBlock, getStatsBlock
+from cache import getOrSetCacheValue
+from modules.stats import STATS_BLOCKS, STATS_CACHE_TTL, StatsBlock, getStatsBlock, makeStatsCacheKey, makeStatsCacheTag
 
 from aiogram import Router, F
 from aiogram.types import  CallbackQuery
@@ -33,11 +34,19 @@ async def stats(event: CallbackQuery, state: FSMContext) -> None:
             period_id: str = call_params["period_id"]
             period: tuple = makePeriodDatetimes(period_id)
         except KeyError:
+            period_id = None
             period = None
 
         stats_block: StatsBlock = getStatsBlock(block_id=stats_block_id)
         stats_block = stats_block(event=event, period=period)
-        message_text = stats_block.makeText()
+
+        stats_cache_key: str = makeStatsCacheKey(stats_block_id, period_id)
+        message_text: str = await getOrSetCacheValue(
+            key=stats_cache_key, 
+            loader=stats_block.makeText, 
+            expire=STATS_CACHE_TTL,
+            tags=(makeStatsCacheTag(stats_block_id),)
+        )
         keyboard: InlineKeyboardBuilder = stats_block.makeKeyboard()
 
     else:
@@ -1,6 +1,10 @@
 import os
+import atexit
 import datetime
 import logging
+import logging.handlers
+import queue
+import threading
 
 
 # Create a custom formatter
@@ -14,22 +18,144 @@ handler.setFormatter(formatter)
 logger.addHandler(handler)
 
 
+LOGS_QUEUE_SIZE = 10000
+LOGS_BATCH_SIZE = 500
+LOGS_SEPARATOR = f"\n\n{'='*50}\n\n"
+LOGS_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    "Puts the records in a bounded queue, dropping them when it's full instead of blocking the caller."
+
+    def __init__(self, queue: queue.Queue) -> None:
+        super().__init__(queue)
+        self._dropped_count = 0
+        self._dropped_count_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_count_lock:
+                self._dropped_count += 1
+
+    def popDroppedCount(self) -> int:
+        "Returns the number of records dropped since the previous call and resets it."
+
+        with self._dropped_count_lock:
+            dropped_count, self._dropped_count = self._dropped_count, 0
+        return dropped_count
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The record is formatted by the writer thread
+        return record
+
+
+class LogsWriter(threading.Thread):
+    """
+    Background thread writing the queued records to `logs/{year}/{month}/{day}/log-{hour}.log`.
+    The records available at once are written with a single write, the file is reopened when the hour changes.
+    """
+
+    def __init__(self, queue: queue.Queue, queue_handler: DroppingQueueHandler) -> None:
+        super().__init__(name="logs-writer", daemon=True)
+        self.queue = queue
+        self.queue_handler = queue_handler
+        self._file = None
+        self._filename = None
+
+    def run(self) -> None:
+        while True:
+            records = [self.queue.get()]
+            while len(records) < LOGS_BATCH_SIZE:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in records
+            records = [record for record in records if record is not None]
+            try:
+                self._writeRecords(records)
+            except OSError:
+                pass
+
+            if stop:
+                self._closeFile()
+                return
+
+    def stop(self) -> None:
+        "Writes the queued records and stops the thread."
+
+        self.queue.put(None)
+        self.join(timeout=5)
+
+    def _writeRecords(self, records: list[logging.LogRecord]) -> None:
+        dropped_count: int = self.queue_handler.popDroppedCount()
+        if dropped_count:
+            now = datetime.datetime.now()
+            self._getFile(now).write(
+                f"{now} [WARNING] - {dropped_count} logs were dropped, the logs queue is full" + LOGS_SEPARATOR
+            )
+
+        chunks: dict[str, list] = {}
+        for record in records:
+            created_at = datetime.datetime.fromtimestamp(record.created)
+            chunks.setdefault(self._makeFilename(created_at), []).append(
+                f"{created_at} [{record.levelname}] - {record.getMessage()}" + LOGS_SEPARATOR
+            )
+
+        for filename, chunk in chunks.items():
+            file = self._openFile(filename)
+            file.write("".join(chunk))
+            file.flush()
+
+    def _makeFilename(self, moment: datetime.datetime) -> str:
+        return f"logs/{moment.year}/{moment.month}/{moment.day}/log-{moment.hour}.log"
+
+    def _getFile(self, moment: datetime.datetime):
+        return self._openFile(self._makeFilename(moment))
+
+    def _openFile(self, filename: str):
+        if filename != self._filename:
+            self._closeFile()
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            self._file = open(filename, "a", encoding="utf-8", errors="backslashreplace")
+            self._filename = filename
+        return self._file
+
+    def _closeFile(self) -> None:
+        if self._file:
+            self._file.close()
+        self._file = None
+        self._filename = None
+
+
+logs_queue = queue.Queue(maxsize=LOGS_QUEUE_SIZE)
+logs_queue_handler = DroppingQueueHandler(logs_queue)
+
+file_logger = logging.getLogger("file_logger")
+file_logger.setLevel(logging.DEBUG)
+file_logger.propagate = False
+file_logger.addHandler(logs_queue_handler)
+
+logs_writer = LogsWriter(logs_queue, logs_queue_handler)
+logs_writer.start()
+atexit.register(logs_writer.stop)
+
+
 def addLog(level: str, text: str) -> None:
     """
-    Adds new log.
+    Adds new log. The log is written to the file by a background thread, so the call never blocks.
 
     :param level: log level (`info`, "debug", "warning", "error", "critical").
     :param text: log text.
     """
-    
-    now = datetime.datetime.now()
-    path = f"logs/{now.year}/{now.month}/{now.day}/"
-    filename = path + f"log-{now.hour}.log"
-
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(filename, "a") as file:
-        separator_string = f"\n\n{'='*50}\n\n"
-        try:
-            file.write(f"{now} [{level.upper()}] - {text}" + separator_string)
-        except:
-            file.write(f"{now} [{level.upper()}] - {text.encode('utf-8')}" + separator_string)
+
+    file_logger.log(LOGS_LEVELS.get(level.lower(), logging.INFO), text)
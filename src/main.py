@@ -1,17 +1,34 @@
 from config import settings
+from database import pool as database_pool
+from cache import redis_client, runCacheInvalidationListener
+from api.telegram import AsyncTelegramAPI
+from modules.mailing import runMailingWorker
+from modules.outbox import runOutboxDispatcher
+from middlewares import RequestContextMiddleware
+from storage import makeFSMStorage
+from references import loadReferences, runReferencesRefresher
+from webhook import runWebhook
 
 from handlers import common, users, feedback, stats, reviews, mailing
 from handlers.forms import add_user_form, add_feedback_request_form, add_review_form, add_mailing_form
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 
 import asyncio
 
 
 async def main() -> None:
-    bot = Bot(token=settings.TELEGRAM_BOT_TOKEN)
-    dp = Dispatcher(storage=MemoryStorage())
+    bot = Bot(
+        token=settings.TELEGRAM_BOT_TOKEN,
+        session=AiohttpSession(api=TelegramAPIServer.from_base(settings.TELEGRAM_API_URL)),
+    )
+    dp = Dispatcher(storage=makeFSMStorage())
+
+    # Middlewares
+    dp.message.middleware(RequestContextMiddleware())
+    dp.callback_query.middleware(RequestContextMiddleware())
 
     # Handlers routers
     dp.include_router(common.router)
@@ -27,7 +44,25 @@ async def main() -> None:
     dp.include_router(add_review_form.router)
     dp.include_router(add_mailing_form.router)
 
-    await dp.start_polling(bot)
+    database_pool.warmUp()
+    await loadReferences()
+    mailing_worker = asyncio.create_task(runMailingWorker())
+    outbox_dispatcher = asyncio.create_task(runOutboxDispatcher())
+    cache_invalidation_listener = asyncio.create_task(runCacheInvalidationListener())
+    references_refresher = asyncio.create_task(runReferencesRefresher())
+    try:
+        if settings.BOT_MODE == "webhook":
+            await runWebhook(dp, bot)
+        else:
+            await dp.start_polling(bot)
+    finally:
+        mailing_worker.cancel()
+        outbox_dispatcher.cancel()
+        cache_invalidation_listener.cancel()
+        references_refresher.cancel()
+        await AsyncTelegramAPI.closeSession()
+        await redis_client.aclose()
+        database_pool.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,40 @@
+from access import getEventUser, getEventEmployee, getRolePermissionsSlugs
+from exceptions import reportException
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, CallbackQuery, TelegramObject
+
+from typing import Any, Awaitable, Callable
+
+
+class RequestContextMiddleware(BaseMiddleware):
+    """
+    Resolves the user, the employee and the permissions of the event sender once per update 
+    and passes them to the handlers as `user`, `employee` and `permissions` arguments.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Message | CallbackQuery,
+        data: dict[str, Any]
+    ) -> Any:
+        if event.from_user is None:
+            return await handler(event, data)
+
+        # Runs outside the handlers `exceptions_catcher`, so the errors are reported here
+        try:
+            user: dict | None = await getEventUser(event)
+            employee: dict | None = await getEventEmployee(event)
+            if employee:
+                permissions: frozenset = await getRolePermissionsSlugs(employee["role_id"])
+            else:
+                permissions = frozenset()
+        except Exception as e:
+            return await reportException(e, event.from_user.id)
+
+        data["user"] = user
+        data["employee"] = employee
+        data["permissions"] = permissions
+
+        return await handler(event, data)
@@ -0,0 +1,78 @@
+import sys
+sys.path.append("../") # src/
+
+from config import settings
+from api.telegram import AsyncTelegramAPI
+from logs import addLog
+
+import aiohttp
+import asyncio
+
+
+alerts_semaphore = asyncio.Semaphore(settings.ALERTS_CONCURRENCY)
+
+
+class AlertDeliveryError(Exception):
+    """
+    Raised when the alert wasn't delivered to some recepients because of a temporary error.
+
+    :param delivered_chat_ids: recepients who are done with (including the ones delivered before), 
+    to be skipped when the alert is retried.
+    """
+
+    def __init__(self, message: str, delivered_chat_ids: frozenset) -> None:
+        super().__init__(message)
+        self.delivered_chat_ids = delivered_chat_ids
+
+
+async def sendAlert(
+    recepients: list[int], 
+    parameters: dict, 
+    delivered_chat_ids: frozenset = frozenset()
+) -> None:
+    """
+    Sends the same message to all the recepients concurrently (at most `ALERTS_CONCURRENCY` at once).
+    A failed delivery is logged and doesn't affect the other recepients.
+    Raises `AlertDeliveryError` after all the attempts if some deliveries failed temporarily
+    (network errors, rate limits, Telegram errors), so the alert can be retried for them only.
+
+    :param parameters: `sendMessage` parameters except `chat_id`.
+    :param delivered_chat_ids: recepients who already received the alert (at the previous attempts).
+    """
+
+    recepients: list = [recepient for recepient in set(recepients) if recepient not in delivered_chat_ids]
+
+    telegram_api = AsyncTelegramAPI(settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_API_URL)
+    delivered: list[bool] = await asyncio.gather(*(
+        _sendAlertMessage(telegram_api, recepient, parameters) for recepient in recepients
+    ))
+
+    failed_count: int = delivered.count(False)
+    if failed_count:
+        raise AlertDeliveryError(
+            f"Alert wasn't delivered to {failed_count} of {len(delivered)} recepients.",
+            delivered_chat_ids=delivered_chat_ids | {
+                recepient for recepient, is_delivered in zip(recepients, delivered) if is_delivered
+            },
+        )
+
+
+async def _sendAlertMessage(telegram_api: AsyncTelegramAPI, recepient: int, parameters: dict) -> bool:
+    "Returns `False` if the message wasn't delivered because of a temporary error."
+
+    async with alerts_semaphore:
+        try:
+            response: dict = await telegram_api.sendRequest(
+                request_method="POST",
+                api_method="sendMessage",
+                parameters={"chat_id": recepient, **parameters},
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            addLog(level="warning", text=f"Alert to {recepient} failed: {e}")
+            return False
+
+    if response["code"] != 200:
+        addLog(level="warning", text=f"Alert to {recepient} failed [{response['code']}]: {response['text']}")
+        return response["code"] != 429 and response["code"] < 500
+
+    return True
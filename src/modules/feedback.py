@@ -1,24 +1,25 @@
 import sys
 sys.path.append("../") # src/
 
-from config import settings
-from api.telegram import TelegramAPI
-
-from cache import setCacheValue, getCacheValue, DAY_SECONDS
+from cache import getOrSetCacheValue, makeCacheKey, DAY_SECONDS
 from utils.feedback import makeFeedbackRequestMessage
+from modules.alerts import sendAlert
+from references import getRoleID
 
-from database.tables.feedback_requests import getFeedbackRequest
-from database.tables.employees import getEmployee, getCarServiceEmployees
-from database.tables.roles import getRole
-from database.tables.users import getUser
+from database.tables.feedback_requests import getFeedbackRequestDetails
+from database.tables.employees import getCarServiceEmployees
 
 import json
 
 
-def alertFeedbackRequested(feedback_request_id: int) -> None:
-    "Sends alerts to employees about adding a new feedback request."
+async def alertFeedbackRequested(feedback_request_id: int, delivered_chat_ids: frozenset = frozenset()) -> None:
+    """
+    Sends alerts to employees about adding a new feedback request.
+
+    :param delivered_chat_ids: recepients skipped as they already received the alert.
+    """
         
-    feedback_request: dict | None = getFeedbackRequest(feedback_request_id)
+    feedback_request: dict | None = await getFeedbackRequestDetails(feedback_request_id)
     if not feedback_request:
         return
 
@@ -26,21 +27,16 @@ def alertFeedbackRequested(feedback_request_id: int) -> None:
     car_service_id: int = feedback_request["car_service_id"]
 
     if employee_id:
-        user_id: int = getEmployee(employee_id=employee_id)["user_id"]
-        telegram_id: int = getUser(user_id=user_id)["telegram_id"]
-        alert_recepients = [telegram_id]
+        alert_recepients = [feedback_request["employee_telegram_id"]]
     else:
-        manager_role_id: int = getRole(role_slug="manager")["id"]
-        employees: str | None = getCacheValue(key=f"employees?role_slug=manager&car_service_id={car_service_id}")
-        if employees:
-            employees: list = json.loads(employees)
-        else:
-            employees: list = getCarServiceEmployees(car_service_id=car_service_id, role_id=manager_role_id)
-            setCacheValue(
-                key=f"employees?role_slug=manager&car_service_id={car_service_id}", 
-                value=json.dumps(employees), 
-                expire=DAY_SECONDS
-            )
+        manager_role_id: int = await getRoleID("manager")
+        employees: list = await getOrSetCacheValue(
+            key=makeCacheKey("employees", role_slug="manager", car_service_id=car_service_id),
+            loader=lambda: getCarServiceEmployees(car_service_id=car_service_id, role_id=manager_role_id),
+            expire=DAY_SECONDS,
+            local=True,
+            tags=("employees",)
+        )
         alert_recepients = [employee["telegram_id"] for employee in employees]
 
     if not alert_recepients:
@@ -66,15 +62,41 @@ def alertFeedbackRequested(feedback_request_id: int) -> None:
         }]]
     })
 
-    telegram_api = TelegramAPI(settings.TELEGRAM_BOT_TOKEN)
-    for recepient in alert_recepients:
-        telegram_api.sendRequest(
-            request_method="POST",
-            api_method="sendMessage",
-            parameters={
-                "chat_id": recepient,
-                "text": message_text,
-                "parse_mode": "Markdown",
-                "reply_markup": keyboard,
-            },
-        )
+    await sendAlert(
+        recepients=alert_recepients,
+        parameters={
+            "text": message_text,
+            "parse_mode": "Markdown",
+            "reply_markup": keyboard,
+        },
+        delivered_chat_ids=delivered_chat_ids,
+    )
+
+
+async def alertFeedbackRequestTaken(feedback_request_id: int, delivered_chat_ids: frozenset = frozenset()) -> None:
+    """
+    Sends an alert to the user about their feedback request being taken by an employee.
+
+    :param delivered_chat_ids: recepients skipped as they already received the alert.
+    """
+
+    feedback_request: dict | None = await getFeedbackRequestDetails(feedback_request_id)
+    if not feedback_request:
+        return
+
+    user_telegram_id: int = feedback_request["user_telegram_id"]
+    feedback_request_message: str = makeFeedbackRequestMessage(feedback_request)
+
+    message_text = (
+        f"*⏳ Ваш запрос на обратную связь принят в работу*" + "\n\n"
+        + feedback_request_message
+    )
+
+    await sendAlert(
+        recepients=[user_telegram_id],
+        parameters={
+            "text": message_text,
+            "parse_mode": "Markdown",
+        },
+        delivered_chat_ids=delivered_chat_ids,
+    )
@@ -2,49 +2,206 @@ import sys
 sys.path.append("../") # src/
 
 from config import settings
-from api.telegram import TelegramAPI
-from utils.common import removeFile
+from api.telegram import AsyncTelegramAPI
+from logs import addLog
+from utils.ratelimit import RateLimiter
+from utils.mailing import makeMailingStatusMessage
 
-from database.tables.users import getUsers
+from database.tables.users import getUsersCount, iterUsersBatches
+from database.tables.mailings import (
+    createMailing, 
+    getMailing,
+    claimMailing, 
+    setMailingRecipientsCount,
+    setMailingProgress, 
+    setMailingCompleted
+)
 
-from aiogram.types import FSInputFile
+import aiohttp
+import asyncio
+import json
+import time
 
-import os
 
+MAILING_LEASE_SECONDS = 60 * 5
+MAILING_MAX_ATTEMPTS = 3
+MAILING_STATUS_UPDATE_SECONDS = 5
 
-def sendMailing(mailing: dict) -> None:
-    users: list = getUsers()
+rate_limiter = RateLimiter(rate=settings.MAILING_RATE_LIMIT, chat_interval=settings.MAILING_CHAT_INTERVAL)
+mailing_enqueued = asyncio.Event()
+
+
+async def enqueueMailing(
+    employee_id: int, 
+    mailing: dict, 
+    status_chat_id: int = None, 
+    status_message_id: int = None
+) -> int:
+    """
+    Saves a mailing job and wakes up the mailing worker. Returns the mailing id.
+
+    :param status_chat_id: chat of the message which will show the delivery progress.
+    :param status_message_id: id of the message which will show the delivery progress.
+    """
+
+    mailing_id: int = await createMailing(
+        employee_id=employee_id,
+        text=mailing["text"],
+        image_file_id=mailing["image_file_id"],
+        status_chat_id=status_chat_id,
+        status_message_id=status_message_id,
+    )
+    mailing_enqueued.set()
+    return mailing_id
+
+
+async def runMailingWorker(poll_interval: int = 60) -> None:
+    """
+    Background loop delivering queued mailings one by one.
+    Unfinished mailings of a crashed worker are resumed once their lease expires.
+    """
+
+    while True:
+        try:
+            mailing: dict | None = await claimMailing(lease_seconds=MAILING_LEASE_SECONDS)
+        except Exception as e:
+            addLog(level="error", text=f"Mailing worker failed to claim a mailing: {e}")
+            mailing = None
+
+        if mailing:
+            try:
+                await sendMailing(mailing)
+            except Exception as e:
+                addLog(level="error", text=f"Mailing №{mailing['id']} was interrupted: {e}")
+                await asyncio.sleep(poll_interval)
+            continue
+
+        mailing_enqueued.clear()
+        try:
+            await asyncio.wait_for(mailing_enqueued.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def sendMailing(mailing: dict) -> None:
+    "Delivers the mailing to all the users starting after the last processed one."
+
+    mailing_id: int = mailing["id"]
+    last_user_id: int = mailing["last_user_id"]
+
+    if mailing["recipients_count"] is None:
+        recipients_count: int = await getUsersCount()
+        mailing["recipients_count"] = recipients_count
+        await setMailingRecipientsCount(mailing_id, recipients_count=recipients_count)
+
+    telegram_api = AsyncTelegramAPI(settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_API_URL)
+    semaphore = asyncio.Semaphore(settings.MAILING_CONCURRENCY)
+
+    status_updated_at = 0.0
+    async for batch in iterUsersBatches(after_user_id=last_user_id, batch_size=settings.MAILING_BATCH_SIZE):
+        delivery = {"sent": 0, "failed": 0, "blocked": 0, "rate_limited": 0}
+        await asyncio.gather(*(
+            _deliverMailingMessage(telegram_api, semaphore, mailing, user["telegram_id"], delivery) 
+            for user in batch
+        ))
+        await setMailingProgress(mailing_id, last_user_id=batch[-1]["id"], delivery=delivery)
+
+        for counter, value in delivery.items():
+            mailing[f"{counter}_count"] += value
+
+        if time.monotonic() - status_updated_at >= MAILING_STATUS_UPDATE_SECONDS:
+            await _updateMailingStatusMessage(telegram_api, mailing)
+            status_updated_at = time.monotonic()
+
+    await setMailingCompleted(mailing_id)
+    await _updateMailingStatusMessage(telegram_api, await getMailing(mailing_id))
+
+
+async def _updateMailingStatusMessage(telegram_api: AsyncTelegramAPI, mailing: dict) -> None:
+    "Edits the admin message showing the mailing progress."
+
+    if not mailing["status_chat_id"] or not mailing["status_message_id"]:
+        return
+
+    try:
+        await telegram_api.sendRequest(
+            request_method="POST",
+            api_method="editMessageText",
+            parameters={
+                "chat_id": mailing["status_chat_id"],
+                "message_id": mailing["status_message_id"],
+                "text": makeMailingStatusMessage(mailing),
+                "parse_mode": "Markdown",
+            },
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        addLog(level="warning", text=f"Mailing №{mailing['id']} status message wasn't updated: {e}")
+
+
+async def _deliverMailingMessage(
+    telegram_api: AsyncTelegramAPI,
+    semaphore: asyncio.Semaphore,
+    mailing: dict,
+    telegram_id: int,
+    delivery: dict
+) -> None:
+    """
+    Sends the mailing message to one user, retrying after `retry_after` when Telegram limits the bot.
+
+    :param delivery: delivery counters of the current batch, updated with the result.
+    """
 
     message_text: str = mailing["text"]
-    image_path: str = mailing["image_path"]
-    
-    telegram_api = TelegramAPI(settings.TELEGRAM_BOT_TOKEN)
-
-    if image_path and os.path.exists(image_path):
-        for user in users:
-            telegram_id: int = user["telegram_id"]
-            telegram_api.sendRequest(
-                request_method="POST",
-                api_method="sendPhoto",
-                parameters={
-                    "chat_id": telegram_id,
-                    "caption": message_text,
-                    "parse_mode": "Markdown",
-                },
-                files={
-                    "photo": FSInputFile(image_path)
-                }
-            )
-        removeFile(file_path=image_path)
-    else:
-        for user in users:
-            telegram_id: int = user["telegram_id"]
-            telegram_api.sendRequest(
-                request_method="POST",
-                api_method="sendMessage",
-                parameters={
-                    "chat_id": telegram_id,
-                    "text": message_text,
-                    "parse_mode": "Markdown",
-                },
-            )
+    image_file_id: str | None = mailing["image_file_id"]
+
+    async with semaphore:
+        for _ in range(MAILING_MAX_ATTEMPTS):
+            await rate_limiter.acquire(telegram_id)
+
+            try:
+                if image_file_id:
+                    response: dict = await telegram_api.sendRequest(
+                        request_method="POST",
+                        api_method="sendPhoto",
+                        parameters={
+                            "chat_id": telegram_id,
+                            "photo": image_file_id,
+                            "caption": message_text,
+                            "parse_mode": "Markdown",
+                        },
+                    )
+                else:
+                    response: dict = await telegram_api.sendRequest(
+                        request_method="POST",
+                        api_method="sendMessage",
+                        parameters={
+                            "chat_id": telegram_id,
+                            "text": message_text,
+                            "parse_mode": "Markdown",
+                        },
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                addLog(level="warning", text=f"Mailing №{mailing['id']} to {telegram_id} failed: {e}")
+                delivery["failed"] += 1
+                return
+
+            match response["code"]:
+                case 200:
+                    delivery["sent"] += 1
+                    return
+                case 403:
+                    delivery["blocked"] += 1
+                    return
+                case 429:
+                    delivery["rate_limited"] += 1
+                case _:
+                    delivery["failed"] += 1
+                    return
+
+            try:
+                retry_after: int = json.loads(response["text"])["parameters"]["retry_after"]
+            except (ValueError, KeyError, TypeError):
+                retry_after = 1
+            rate_limiter.pause(retry_after)
+
+        delivery["failed"] += 1
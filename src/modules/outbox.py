@@ -0,0 +1,123 @@
+import sys
+sys.path.append("../") # src/
+
+from logs import addLog
+
+from modules.alerts import AlertDeliveryError
+from modules.feedback import alertFeedbackRequested, alertFeedbackRequestTaken
+from modules.reviews import alertReviewAdded
+
+from database.tables.outbox import (
+    claimOutboxEvents, 
+    setOutboxEventProcessed, 
+    setOutboxEventFailed, 
+    deleteProcessedOutboxEvents
+)
+
+from typing import Awaitable, Callable
+import asyncio
+import time
+
+
+OUTBOX_BATCH_SIZE = 20
+OUTBOX_LEASE_SECONDS = 60 * 2
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_MAX_RETRY_SECONDS = 60 * 10
+OUTBOX_CLEANUP_INTERVAL_SECONDS = 60 * 60
+OUTBOX_PROCESSED_KEEP_SECONDS = 60 * 60 * 24 * 7
+
+# event -> coroutine function delivering it, called with the event payload 
+# and the recepients who already received it at the previous attempts
+outbox_handlers: dict[str, Callable[[dict, frozenset], Awaitable]] = {
+    "feedback_request_created": lambda payload, delivered_chat_ids: alertFeedbackRequested(
+        payload["feedback_request_id"], delivered_chat_ids=delivered_chat_ids
+    ),
+    "feedback_request_taken": lambda payload, delivered_chat_ids: alertFeedbackRequestTaken(
+        payload["feedback_request_id"], delivered_chat_ids=delivered_chat_ids
+    ),
+    "review_created": lambda payload, delivered_chat_ids: alertReviewAdded(
+        payload["review_id"], delivered_chat_ids=delivered_chat_ids
+    ),
+}
+
+outbox_event_added = asyncio.Event()
+
+
+def wakeOutboxDispatcher() -> None:
+    "Makes the dispatcher of this process check the outbox right away instead of at the next poll."
+    outbox_event_added.set()
+
+
+async def runOutboxDispatcher(poll_interval: int = 10) -> None:
+    """
+    Background loop delivering the outbox events in batches.
+    An event is marked processed only after its delivery, so it's delivered at least once: 
+    failed events are retried with a growing delay, events of a crashed dispatcher are claimed again 
+    once their lease expires.
+    The processed events are deleted after `OUTBOX_PROCESSED_KEEP_SECONDS`.
+    """
+
+    cleaned_at: float = 0.0
+    while True:
+        if time.monotonic() - cleaned_at >= OUTBOX_CLEANUP_INTERVAL_SECONDS:
+            cleaned_at = time.monotonic()
+            try:
+                await deleteProcessedOutboxEvents(older_than_seconds=OUTBOX_PROCESSED_KEEP_SECONDS)
+            except Exception as e:
+                addLog(level="error", text=f"Outbox dispatcher failed to delete the processed events: {e}")
+
+        try:
+            outbox_events: list = await claimOutboxEvents(
+                batch_size=OUTBOX_BATCH_SIZE, 
+                lease_seconds=OUTBOX_LEASE_SECONDS, 
+                max_attempts=OUTBOX_MAX_ATTEMPTS
+            )
+        except Exception as e:
+            addLog(level="error", text=f"Outbox dispatcher failed to claim events: {e}")
+            outbox_events = []
+
+        if outbox_events:
+            results: list = await asyncio.gather(
+                *(_dispatchOutboxEvent(outbox_event) for outbox_event in outbox_events), 
+                return_exceptions=True
+            )
+            errors: list = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                # The events stay locked until their lease expires
+                addLog(level="error", text=f"Outbox dispatcher failed to save the events results: {errors[0]}")
+                await asyncio.sleep(poll_interval)
+            continue
+
+        outbox_event_added.clear()
+        try:
+            await asyncio.wait_for(outbox_event_added.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _dispatchOutboxEvent(outbox_event: dict) -> None:
+    outbox_event_id: int = outbox_event["id"]
+    delivered_chat_ids = frozenset(outbox_event["delivered_chat_ids"] or ())
+
+    try:
+        handler: Callable[[dict, frozenset], Awaitable] = outbox_handlers[outbox_event["event"]]
+        await handler(outbox_event["payload"], delivered_chat_ids)
+    except Exception as e:
+        attempts: int = outbox_event["attempts"]
+        addLog(
+            level="error" if attempts >= OUTBOX_MAX_ATTEMPTS else "warning", 
+            text=f"Outbox event №{outbox_event_id} ({outbox_event['event']}) failed [attempt {attempts}]: {e}"
+        )
+        retry_after: int = min(5 * 2 ** attempts, OUTBOX_MAX_RETRY_SECONDS)
+        if isinstance(e, AlertDeliveryError):
+            # Only the recepients who didn't get the alert are retried
+            delivered_chat_ids = e.delivered_chat_ids
+        await setOutboxEventFailed(
+            outbox_event_id, 
+            error=repr(e), 
+            retry_after=retry_after, 
+            delivered_chat_ids=sorted(delivered_chat_ids)
+        )
+        return
+
+    await setOutboxEventProcessed(outbox_event_id)
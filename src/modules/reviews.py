@@ -1,46 +1,44 @@
 import sys
 sys.path.append("../") # src/
 
-from config import settings
-from api.telegram import TelegramAPI
-
-from cache import setCacheValue, getCacheValue, DAY_SECONDS
+from cache import getOrSetCacheValue, makeCacheKey, DAY_SECONDS
 from utils.reviews import makeReviewMessage
+from modules.alerts import sendAlert
+from references import getRoleID
 
-from database.tables.reviews import getReview
-from database.tables.employees import getEmployee, getCarServiceEmployees
-from database.tables.roles import getRole
-from database.tables.users import getUser
+from database.tables.reviews import getReviewDetails
+from database.tables.employees import getCarServiceEmployees
 
 import json
 
 
-def alertReviewAdded(review_id: int) -> None:
-    "Sends alerts to management about adding a new review."
+async def alertReviewAdded(review_id: int, delivered_chat_ids: frozenset = frozenset()) -> None:
+    """
+    Sends alerts to management about adding a new review.
+
+    :param delivered_chat_ids: recepients skipped as they already received the alert.
+    """
         
-    review: dict | None = getReview(review_id)
+    review: dict | None = await getReviewDetails(review_id)
     if not review:
         return
 
     car_service_id: int = review["car_service_id"]
 
     management_roles = {
-        "ceo": getRole(role_slug="ceo")["id"],
-        "cto": getRole(role_slug="cto")["id"],
+        "ceo": await getRoleID("ceo"),
+        "cto": await getRoleID("cto"),
     }
 
     alert_recepients = []
     for role_slug, role_id in management_roles.items():
-        management: str | None = getCacheValue(key=f"employees?role_slug={role_slug}&car_service_id={car_service_id}")
-        if management:
-            management: list = json.loads(management)
-        else:
-            management: list = getCarServiceEmployees(car_service_id=car_service_id, role_id=role_id)
-            setCacheValue(
-                key=f"employees?role_slug={role_slug}&car_service_id={car_service_id}", 
-                value=json.dumps(management), 
-                expire=DAY_SECONDS
-            )
+        management: list = await getOrSetCacheValue(
+            key=makeCacheKey("employees", role_slug=role_slug, car_service_id=car_service_id),
+            loader=lambda role_id=role_id: getCarServiceEmployees(car_service_id=car_service_id, role_id=role_id),
+            expire=DAY_SECONDS,
+            local=True,
+            tags=("employees",)
+        )
         alert_recepients.extend([employee["telegram_id"] for employee in management])
 
     if not alert_recepients:
@@ -53,14 +51,11 @@ def alertReviewAdded(review_id: int) -> None:
         + review_message
     )
 
-    telegram_api = TelegramAPI(settings.TELEGRAM_BOT_TOKEN)
-    for recepient in alert_recepients:
-        telegram_api.sendRequest(
-            request_method="POST",
-            api_method="sendMessage",
-            parameters={
-                "chat_id": recepient,
-                "text": message_text,
-                "parse_mode": "Markdown",
-            },
-        )
+    await sendAlert(
+        recepients=alert_recepients,
+        parameters={
+            "text": message_text,
+            "parse_mode": "Markdown",
+        },
+        delivered_chat_ids=delivered_chat_ids,
+    )
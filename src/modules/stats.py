@@ -1,15 +1,11 @@
 import sys
 sys.path.append("../") # src/
 
-from utils.common import isDateInRange
-
-from utils.common import getCallParams
+from utils.common import getCallParams, getCurrentDateTime
 from states import updateStateCallbackParams
+from cache import invalidateCacheTags, MINUTE_SECONDS
 
-from database.tables.add_links import getAddLinks
-from database.tables.feedback_requests import getFeedbackRequests
-from database.tables.car_services import getEmployeeCarServices, getCarService
-from database.tables.employees import getEmployee
+from database.tables.stats import getCompletedFeedbackRequestsStats, getAddLinksActivationsStats
 
 from aiogram.types import CallbackQuery
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
@@ -18,6 +14,8 @@ import abc
 from datetime import datetime
 
 
+STATS_CACHE_TTL = MINUTE_SECONDS * 5
+
 STATS_BLOCKS = {
     "users": {
         "name": "🧑🏼‍💼 Пользователи",
@@ -41,7 +39,7 @@ class StatsBlock(abc.ABC):
             self.period_text = ""
 
     @abc.abstractmethod
-    def makeText(self) -> str: pass
+    async def makeText(self) -> str: pass
 
     def makeKeyboard(self) -> InlineKeyboardBuilder: 
         keyboard = InlineKeyboardBuilder()
@@ -93,83 +91,71 @@ class StatsBlock(abc.ABC):
         return keyboard
 
 
-def getStatsBlock(block_id: str) -> StatsBlock:
-    class_name = STATS_BLOCKS[block_id]["class"]
-    return globals()[class_name]
+    @staticmethod
+    def makeCarServicesStatsText(stats: list) -> str:
+        """
+        Generates a text with car services totals and their employees values.
 
+        :param stats: rows with `car_service_id`, `car_service_name`, `employee_fullname` and `value` keys.
+        """
 
-class UsersStats(StatsBlock):
-    def makeText(self) -> str:
-        add_links: list = getAddLinks()
-
-        employees_add_links_activations = {}
-        for add_link in add_links:
-            employee_id: int = add_link["employee_id"]
-            activations: int = add_link["activations"]
-            created_at: datetime = add_link["created_at"]
+        car_services_stats = {}
+        for row in stats:
+            car_service_id: int = row["car_service_id"]
+            if car_service_id not in car_services_stats:
+                car_services_stats[car_service_id] = {
+                    "name": row["car_service_name"],
+                    "common": 0,
+                    "employees": []
+                }
+            car_services_stats[car_service_id]["common"] += row["value"]
+            car_services_stats[car_service_id]["employees"].append(
+                f"╭➤ {row['employee_fullname']}: *{row['value']}*"
+            )
 
-            if (
-                activations == 0
-                or (self.period and isDateInRange(created_at, self.period) is False)
-            ):
-                continue
+        car_services_text_items = []
+        for car_service_data in car_services_stats.values():
+            car_service_text = (
+                f"• {car_service_data['name']}: {car_service_data['common']}" + "\n"
+                + "\n".join(car_service_data["employees"])
+            )
+            car_services_text_items.append(car_service_text)
 
-            if employee_id not in employees_add_links_activations.keys():
-                employees_add_links_activations[employee_id] = 0
-            employees_add_links_activations[employee_id] += activations
+        if not car_services_text_items:
+            return "🔎 Нет данных"
 
+        return "\n\n".join(car_services_text_items)
 
-        car_services_add_links_activations = {}
-        for employee_id, activations in employees_add_links_activations.items():
-            employee: dict = getEmployee(employee_id=employee_id)
-            employee_fullname: str = employee["fullname"]
-            employee_car_services: list = getEmployeeCarServices(employee_id=employee_id)
 
-            if not employee_car_services:
-                continue
+def getStatsBlock(block_id: str) -> StatsBlock:
+    class_name = STATS_BLOCKS[block_id]["class"]
+    return globals()[class_name]
 
-            car_service_id: int = employee_car_services[0]["car_service_id"]
 
-            if car_service_id not in car_services_add_links_activations.keys():
-                car_services_add_links_activations[car_service_id] = {
-                    "common": 0,
-                    "employees": []
-                }
+def makeStatsCacheKey(block_id: str, period_id: str = None) -> str:
+    "Generates a cache key of the rendered stats block text (periods depend on the current date)."
 
-            car_services_add_links_activations[car_service_id]["common"] += activations
-            car_services_add_links_activations[car_service_id]["employees"].append(
-                {"fullname": employee_fullname, "activations": activations}
-            )
+    current_date = getCurrentDateTime().date()
+    return f"stats?block_id={block_id}&period_id={period_id}&date={current_date}"
 
 
-        add_links_activations_text_items = []
+def makeStatsCacheTag(block_id: str) -> str:
+    "Returns the cache tag registering all the cached texts of the stats block."
+    return f"stats:{block_id}"
 
-        for car_service_id, car_service_data in car_services_add_links_activations.items():
-            car_service: dict = getCarService(car_service_id=car_service_id)
-            car_service_name: str = car_service["name"]
 
-            common_activations: int = car_service_data["common"]
-            employees_activations: list[dict] = car_service_data["employees"]
+async def invalidateStatsCache(block_id: str) -> None:
+    "Deletes all the cached texts of the stats block after its data has changed."
+    await invalidateCacheTags(makeStatsCacheTag(block_id))
 
-            car_service_text_items = []
-            for employee in employees_activations:
-                employee_fullname: str = employee["fullname"]
-                employee_activations: int = employee["activations"]
-                car_service_text_items.append(f"╭➤ {employee_fullname}: *{employee_activations}*")
 
-            car_service_text = (
-                f"• {car_service_name}: {common_activations}" + "\n"
-                + "\n".join(car_service_text_items)
-            )
-
-            add_links_activations_text_items.append(car_service_text)
+class UsersStats(StatsBlock):
+    async def makeText(self) -> str:
+        add_links_activations: list = await getAddLinksActivationsStats(self.period)
 
         add_links_activations_text = (
             f"*{'—'*3} ➕ Добавлено пользователей {'—'*3}*" + "\n"
-            + (
-                "\n\n".join(add_links_activations_text_items) if add_links_activations_text_items 
-                else "🔎 Нет данных"
-            )
+            + self.makeCarServicesStatsText(add_links_activations)
         )
 
         text = (
@@ -181,70 +167,14 @@ class UsersStats(StatsBlock):
 
 
 class FeedbackRequestsStats(StatsBlock):
-    def makeText(self) -> str:
-        feedback_requests = getFeedbackRequests()
-
-        car_services_completed_feedback_requests = {}
-        for feedback_request in feedback_requests:
-            car_service_id: int = feedback_request["car_service_id"]
-            employee_id: int = feedback_request["employee_id"]
-            completed_at: datetime = feedback_request["completed_at"]
-
-            if (
-                completed_at is None
-                or (self.period and isDateInRange(completed_at, self.period) is False)
-            ):
-                continue
-
-            if car_service_id not in car_services_completed_feedback_requests:
-                car_services_completed_feedback_requests[car_service_id] = {
-                    "common": 0,
-                    "employees": {}
-                }
-
-            if employee_id not in car_services_completed_feedback_requests[car_service_id]["employees"]:
-                employee: dict = getEmployee(employee_id=employee_id)
-                employee_fullname: str = employee["fullname"]
-                car_services_completed_feedback_requests[car_service_id]["employees"][employee_id] = {
-                    "fullname": employee_fullname, 
-                    "completed": 0
-                }
-
-            car_services_completed_feedback_requests[car_service_id]["common"] += 1
-            car_services_completed_feedback_requests[car_service_id]["employees"][employee_id]["completed"] += 1
-
-
-        completed_feedback_requests_text_items = []
-
-        for car_service_id, car_service_data in car_services_completed_feedback_requests.items():
-            car_service: dict = getCarService(car_service_id=car_service_id)
-            car_service_name: str = car_service["name"]
-
-            common_completed: int = car_service_data["common"]
-            employees_completed: list[dict] = car_service_data["employees"]
-
-            car_service_text_items = []
-            for employee in employees_completed.values():
-                employee_fullname: str = employee["fullname"]
-                employee_completed: int = employee["completed"]
-                car_service_text_items.append(f"╭➤ {employee_fullname}: *{employee_completed}*")
-
-            car_service_text = (
-                f"• {car_service_name}: {common_completed}" + "\n"
-                + "\n".join(car_service_text_items)
-            )
-
-            completed_feedback_requests_text_items.append(car_service_text)
+    async def makeText(self) -> str:
+        completed_feedback_requests: list = await getCompletedFeedbackRequestsStats(self.period)
 
         completed_feedback_requests_text = (
             f"*{'—'*3} ✅ Обработано запросов {'—'*3}*" + "\n"
-            + (
-                "\n\n".join(completed_feedback_requests_text_items) if completed_feedback_requests_text_items 
-                else "🔎 Нет данных"
-            )
+            + self.makeCarServicesStatsText(completed_feedback_requests)
         )
 
-
         text = (
             "*📞 Статистика | Запросы обратной связи*" + "\n\n"
             + completed_feedback_requests_text
@@ -0,0 +1,143 @@
+from cache import redis_client, HOUR_SECONDS
+from logs import addLog
+
+from database.tables.roles import getRoles
+from database.tables.permissions import getRolesPermissions
+from database.tables.car_services import getCarServices
+from database.tables.contact_methods import getContactMethods
+
+from types import MappingProxyType
+from typing import Callable, TypeVar
+import asyncio
+
+
+REFERENCES_REFRESH_SECONDS = HOUR_SECONDS
+REFERENCES_CHANNEL = "references:refresh"
+
+T = TypeVar("T")
+
+
+class ReferencesRegistry:
+    """
+    Immutable snapshot of the static tables: roles, roles permissions, car services and contact methods.
+    A refresh replaces the whole registry, so a handler always sees a consistent snapshot.
+    """
+
+    def __init__(self, roles: list, roles_permissions: list, car_services: list, contact_methods: list) -> None:
+        permissions_slugs: dict[int, set] = {role["id"]: set() for role in roles}
+        for role_permission in roles_permissions:
+            permissions_slugs.setdefault(role_permission["role_id"], set()).add(role_permission["slug"])
+
+        self.roles: tuple = tuple(MappingProxyType(role) for role in roles)
+        self.roles_by_id = MappingProxyType({role["id"]: role for role in self.roles})
+        self.roles_by_slug = MappingProxyType({role["slug"]: role for role in self.roles})
+        self.roles_permissions = MappingProxyType(
+            {role_id: frozenset(slugs) for role_id, slugs in permissions_slugs.items()}
+        )
+
+        self.car_services: tuple = tuple(MappingProxyType(car_service) for car_service in car_services)
+        self.car_services_by_id = MappingProxyType({car_service["id"]: car_service for car_service in self.car_services})
+
+        self.contact_methods: tuple = tuple(MappingProxyType(contact_method) for contact_method in contact_methods)
+        self.contact_methods_by_id = MappingProxyType(
+            {contact_method["id"]: contact_method for contact_method in self.contact_methods}
+        )
+
+    def getRoleID(self, role_slug: str) -> int:
+        return self.roles_by_slug[role_slug]["id"]
+
+    def getRolePermissions(self, role_id: int) -> frozenset:
+        return self.roles_permissions.get(role_id, frozenset())
+
+
+registry: ReferencesRegistry | None = None
+registry_reload_lock = asyncio.Lock()
+
+
+def getReferences() -> ReferencesRegistry:
+    "Returns the current references registry (loaded by `loadReferences()` at startup)."
+
+    if registry is None:
+        raise RuntimeError("References registry isn't loaded")
+    return registry
+
+
+async def loadReferences() -> ReferencesRegistry:
+    "Loads all the reference tables concurrently and replaces the registry."
+
+    global registry
+
+    roles, roles_permissions, car_services, contact_methods = await asyncio.gather(
+        getRoles(),
+        getRolesPermissions(),
+        getCarServices(),
+        getContactMethods(),
+    )
+    registry = ReferencesRegistry(
+        roles=roles,
+        roles_permissions=roles_permissions,
+        car_services=car_services,
+        contact_methods=contact_methods
+    )
+    return registry
+
+
+async def getReference(lookup: Callable[[ReferencesRegistry], T]) -> T:
+    """
+    Returns `lookup(registry)`, reloading the registry once if the lookup raises `KeyError`
+    (the row was added after the last refresh). Raises `KeyError` if the row still isn't found.
+    """
+
+    current_registry: ReferencesRegistry = getReferences()
+    try:
+        return lookup(current_registry)
+    except KeyError:
+        pass
+
+    async with registry_reload_lock:
+        # The concurrent lookups of the same missing row reload the registry only once
+        if registry is current_registry:
+            await loadReferences()
+
+    return lookup(getReferences())
+
+
+async def getCarService(car_service_id: int) -> MappingProxyType:
+    return await getReference(lambda references: references.car_services_by_id[car_service_id])
+
+
+async def getRoleID(role_slug: str) -> int:
+    return await getReference(lambda references: references.getRoleID(role_slug))
+
+
+async def getRolePermissions(role_id: int) -> frozenset:
+    "Returns the role permissions slugs (an unknown role reloads the registry and has no permissions)."
+
+    try:
+        await getReference(lambda references: references.roles_by_id[role_id])
+    except KeyError:
+        return frozenset()
+    return getReferences().getRolePermissions(role_id)
+
+
+async def signalReferencesChanged() -> None:
+    "Makes all the bot processes reload the references (after changing a reference table)."
+    await redis_client.publish(REFERENCES_CHANNEL, "1")
+
+
+async def runReferencesRefresher() -> None:
+    "Background loop reloading the references every `REFERENCES_REFRESH_SECONDS` or on a change signal."
+
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(REFERENCES_CHANNEL)
+                while True:
+                    await pubsub.get_message(ignore_subscribe_messages=True, timeout=REFERENCES_REFRESH_SECONDS)
+                    try:
+                        await loadReferences()
+                    except Exception as e:
+                        addLog(level="error", text=f"References weren't refreshed: {e}")
+        except Exception as e:
+            addLog(level="error", text=f"References refresher failed, resubscribing: {e}")
+            await asyncio.sleep(5)
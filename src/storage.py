@@ -0,0 +1,69 @@
+from config import settings
+from cache import redis_client
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage, DefaultKeyBuilder
+
+import functools
+import json
+
+
+class StatesTTLRedisStorage(RedisStorage):
+    """
+    Redis FSM storage expiring the forms state and data together, depending on the states group.
+
+    :param states_ttl: states group name -> seconds the state and data are kept (`state_ttl` for the other groups).
+    """
+
+    def __init__(self, *args, states_ttl: dict[str, int] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.states_ttl = states_ttl or {}
+
+    def _getStateTTL(self, state_name: str | None) -> int:
+        if not state_name:
+            return self.state_ttl
+        states_group_name: str = state_name.split(":")[0]
+        return self.states_ttl.get(states_group_name, self.state_ttl)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        redis_key: str = self.key_builder.build(key, "state")
+        if state is None:
+            await self.redis.delete(redis_key)
+            return
+
+        state_name: str = state.state if isinstance(state, State) else state
+        ttl: int = self._getStateTTL(state_name)
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            pipeline.set(redis_key, state_name, ex=ttl)
+            # The data written at the previous step must live as long as the new state
+            pipeline.expire(self.key_builder.build(key, "data"), ttl)
+            await pipeline.execute()
+
+    async def set_data(self, key: StorageKey, data: dict) -> None:
+        if not isinstance(data, dict) or not data:
+            return await super().set_data(key, data)
+
+        state_name: str | None = await self.get_state(key)
+        await self.redis.set(
+            self.key_builder.build(key, "data"),
+            self.json_dumps(data),
+            ex=self._getStateTTL(state_name),
+        )
+
+
+def makeFSMStorage() -> BaseStorage:
+    "Returns the FSM storage selected by `settings.FSM_STORAGE`."
+
+    if settings.FSM_STORAGE == "memory":
+        return MemoryStorage()
+
+    return StatesTTLRedisStorage(
+        redis=redis_client,
+        key_builder=DefaultKeyBuilder(prefix="fsm"),
+        state_ttl=settings.FSM_STATE_TTL,
+        data_ttl=settings.FSM_STATE_TTL,
+        states_ttl=settings.FSM_STATES_TTL,
+        json_dumps=functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":")),
+    )
@@ -1,33 +1,15 @@
-from database.tables.users import getUser
-from database.tables.car_services import getCarService
-from database.tables.employees import getEmployee
-from database.tables.contact_methods import getContactMethod
-
-
 def makeFeedbackRequestMessage(feedback_request: dict) -> str:
-    "Generates a message with data about the feedback request."
-
-    car_service_id: int = feedback_request["car_service_id"]
-    employee_id: int | None = feedback_request["employee_id"]
-    user_id: int = feedback_request["user_id"]
-    contact_method_id: int | None = feedback_request["contact_method_id"]
-    request_reason: str | None = feedback_request["request_reason"]
-
-    user_phone: str = getUser(user_id=user_id)["phone"]
-    car_service: str = getCarService(car_service_id=car_service_id)["name"]
-
-    if employee_id:
-        employee: str = getEmployee(employee_id=employee_id)["fullname"]
-    else:
-        employee = "не назначен"
+    """
+    Generates a message with data about the feedback request.
 
-    if contact_method_id:
-        contact_method: str = getContactMethod(contact_method_id=contact_method_id)["name"]
-    else:
-        contact_method = "не указан"
+    :param feedback_request: feedback request returned by `getFeedbackRequestDetails()`.
+    """
 
-    if not request_reason:
-        request_reason = "не указана"
+    user_phone: str = feedback_request["user_phone"]
+    car_service: str = feedback_request["car_service_name"]
+    employee: str = feedback_request["employee_fullname"] or "не назначен"
+    contact_method: str = feedback_request["contact_method_name"] or "не указан"
+    request_reason: str = feedback_request["request_reason"] or "не указана"
 
     feedback_request_message = (
         f"📞 Номер телефона: `{user_phone}`" + "\n\n"
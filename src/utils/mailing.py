@@ -0,0 +1,47 @@
+from utils.common import getCurrentDateTime
+
+from datetime import datetime, timedelta
+
+
+def makeMailingStatusMessage(mailing: dict) -> str:
+    "Generates a message with the delivery progress of the mailing."
+
+    status: str = mailing["status"]
+    recipients_count: int = mailing["recipients_count"] or 0
+    sent_count: int = mailing["sent_count"]
+    failed_count: int = mailing["failed_count"]
+    blocked_count: int = mailing["blocked_count"]
+    rate_limited_count: int = mailing["rate_limited_count"]
+    started_at: datetime | None = mailing["started_at"]
+    finished_at: datetime | None = mailing["finished_at"]
+
+    processed_count = sent_count + failed_count + blocked_count
+
+    if started_at:
+        end: datetime = finished_at or getCurrentDateTime().replace(tzinfo=None)
+        elapsed_seconds: float = max((end - started_at).total_seconds(), 1)
+        speed: float = processed_count / elapsed_seconds
+    else:
+        elapsed_seconds = 0; speed = 0
+
+    if status == "completed":
+        heading = "*✅ Рассылка завершена*"
+        eta = "—"
+    else:
+        heading = "*📨 Рассылка выполняется*" if status == "running" else "*⏳ Рассылка в очереди*"
+        remaining_count = max(recipients_count - processed_count, 0)
+        eta = str(timedelta(seconds=round(remaining_count / speed))) if speed else "рассчитывается"
+
+    mailing_status_message = (
+        heading + "\n\n"
+        + f"👥 Обработано: *{processed_count} / {recipients_count}*" + "\n"
+        + f"✅ Доставлено: *{sent_count}*" + "\n"
+        + f"🚫 Заблокировали бота: *{blocked_count}*" + "\n"
+        + f"❌ Ошибки: *{failed_count}*" + "\n"
+        + f"⏱ Ограничения Telegram: *{rate_limited_count}*" + "\n\n"
+        + f"⚡️ Скорость: *{speed:.1f} сообщ./сек.*" + "\n"
+        + f"🕓 Прошло: *{timedelta(seconds=round(elapsed_seconds))}*" + "\n"
+        + f"🏁 Осталось: *{eta}*"
+    )
+
+    return mailing_status_message
@@ -9,10 +9,23 @@ import math
 
 
 class Paginator:
-    def __init__(self, array: list|tuple, offset: int, page_callback: str, back_callback: str = None) -> None:
+    def __init__(
+        self, 
+        array: list|tuple, 
+        offset: int, 
+        page_callback: str, 
+        back_callback: str = None, 
+        items_count: int = None
+    ) -> None:
+        """
+        :param items_count: total number of items, if passed - `array` contains only the items 
+        of the requested page (already paginated on the database side).
+        """
+
         self.array = array
         self.offset = offset
-        self.pages_count = math.ceil(len(array) / offset)
+        self.items_count = items_count
+        self.pages_count = math.ceil((len(array) if items_count is None else items_count) / offset)
         self.page_callback = page_callback
         self.back_callback = back_callback
 
@@ -24,9 +37,12 @@ class Paginator:
                 f"Page number value cannot be higher than pages count [page: {page} / {self.pages_count}]."
             )
 
-        start_index =  self.offset * (page - 1)
-        end_index = start_index + self.offset
-        array_items = self.array[start_index:end_index]
+        if self.items_count is None:
+            start_index =  self.offset * (page - 1)
+            end_index = start_index + self.offset
+            array_items = self.array[start_index:end_index]
+        else:
+            array_items = self.array
         array_items_count = len(array_items)
         
         keyboard = InlineKeyboardBuilder()
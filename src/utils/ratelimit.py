@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Spaces out outgoing messages to respect a global rate and a minimal interval per chat.
+
+    :param rate: maximum number of messages per second across all chats.
+    :param chat_interval: minimal number of seconds between two messages to the same chat.
+    """
+
+    def __init__(self, rate: float = 30, chat_interval: float = 1.0) -> None:
+        self.interval = 1 / rate
+        self.chat_interval = chat_interval
+        self._next_slot = 0.0
+        self._chats_next_slot: dict[int, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, chat_id: int) -> None:
+        "Waits until a message to the chat can be sent."
+
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._chats_next_slot.get(chat_id, 0.0))
+            self._next_slot = slot + self.interval
+            self._chats_next_slot[chat_id] = slot + self.chat_interval
+
+            if len(self._chats_next_slot) > 10_000:
+                self._chats_next_slot = {
+                    chat: chat_slot for chat, chat_slot in self._chats_next_slot.items() if chat_slot > now
+                }
+
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        "Postpones all the next messages (used when Telegram answers with `retry_after`)."
+
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
@@ -1,20 +1,14 @@
-from database.tables.users import getUser
-from database.tables.car_services import getCarService
-
-
 def makeReviewMessage(review: dict) -> str:
-    "Generates a message with data about the review."
+    """
+    Generates a message with data about the review.
 
-    user_id: int = review["user_id"]
-    car_service_id: int = review["car_service_id"]
-    text: str = review["text"]
-    rating: str = review["rating"]
+    :param review: review returned by `getReviewDetails()`.
+    """
 
-    user_phone: str = getUser(user_id=user_id)["phone"]
-    car_service: str = getCarService(car_service_id=car_service_id)["name"]
-
-    if not text:
-        text = "не указан"
+    user_phone: str = review["user_phone"]
+    car_service: str = review["car_service_name"]
+    text: str = review["text"] or "не указан"
+    rating: str = review["rating"]
 
     review_message = (
         f"📞 Номер телефона: `{user_phone}`" + "\n\n"
@@ -0,0 +1,130 @@
+from config import settings
+from logs import addLog
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+
+import asyncio
+
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class UpdatesWorkerPool:
+    """
+    Bounded pool of workers handling the updates received by the webhook.
+    Updates of the same chat always go to the same worker, so they are handled in the order they came.
+
+    :param workers_count: number of workers (updates of different chats are handled concurrently).
+    :param queue_size: maximum number of updates waiting for each worker, the webhook waits when it's full.
+    """
+
+    def __init__(self, dp: Dispatcher, bot: Bot, workers_count: int = 16, queue_size: int = 100) -> None:
+        self.dp = dp
+        self.bot = bot
+        self.queues: list[asyncio.Queue] = [asyncio.Queue(maxsize=queue_size) for _ in range(workers_count)]
+        self.workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self.workers = [asyncio.create_task(self._runWorker(queue)) for queue in self.queues]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        "Waits up to `timeout` seconds for the queued updates to be handled, then stops the workers."
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*(queue.join() for queue in self.queues)), timeout=timeout)
+        except asyncio.TimeoutError:
+            addLog(level="warning", text="Webhook workers were stopped with unhandled updates.")
+
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+
+    async def put(self, update: Update) -> None:
+        queue: asyncio.Queue = self.queues[_getUpdateChatID(update) % len(self.queues)]
+        await queue.put(update)
+
+    async def _runWorker(self, queue: asyncio.Queue) -> None:
+        while True:
+            update: Update = await queue.get()
+            try:
+                await self.dp.feed_update(self.bot, update)
+            except Exception as e:
+                addLog(level="error", text=f"Update №{update.update_id} handling failed: {e}")
+            finally:
+                queue.task_done()
+
+
+def _getUpdateChatID(update: Update) -> int:
+    "Returns the id of the chat the update belongs to (or of its sender, or the update id)."
+
+    try:
+        event = update.event
+    except Exception:
+        return update.update_id
+
+    chat = getattr(event, "chat", None) or getattr(getattr(event, "message", None), "chat", None)
+    if chat:
+        return chat.id
+
+    user = getattr(event, "from_user", None)
+    if user:
+        return user.id
+
+    return update.update_id
+
+
+def makeWebhookApp(bot: Bot, workers_pool: UpdatesWorkerPool) -> web.Application:
+    "Returns the aiohttp application receiving the updates on `settings.WEBHOOK_PATH`."
+
+    async def handleUpdate(request: web.Request) -> web.Response:
+        if settings.WEBHOOK_SECRET and request.headers.get(SECRET_TOKEN_HEADER) != settings.WEBHOOK_SECRET:
+            return web.Response(status=401)
+
+        try:
+            update = Update.model_validate(await request.json(), context={"bot": bot})
+        except ValueError:
+            return web.Response(status=400)
+
+        await workers_pool.put(update)
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(settings.WEBHOOK_PATH, handleUpdate)
+    return app
+
+
+async def runWebhook(dp: Dispatcher, bot: Bot) -> None:
+    "Sets the bot webhook and handles the received updates until the task is cancelled."
+
+    workers_pool = UpdatesWorkerPool(
+        dp=dp,
+        bot=bot,
+        workers_count=settings.WEBHOOK_WORKERS,
+        queue_size=settings.WEBHOOK_QUEUE_SIZE,
+    )
+    runner = web.AppRunner(makeWebhookApp(bot, workers_pool))
+
+    await runner.setup()
+    workers_pool.start()
+    try:
+        site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+        await site.start()
+
+        if settings.WEBHOOK_URL:
+            await bot.set_webhook(
+                url=settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH,
+                secret_token=settings.WEBHOOK_SECRET,
+                allowed_updates=dp.resolve_used_update_types(),
+            )
+
+        await dp.emit_startup(bot=bot)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await dp.emit_shutdown(bot=bot)
+    finally:
+        await runner.cleanup()
+        await workers_pool.stop()
+        await bot.session.close()